@@ -43,6 +43,10 @@ class ChatRequest(BaseModel):
         default=None,
         description="Existing conversation ID to append messages to"
     )
+    include_sources: bool = Field(
+        default=True,
+        description="Return the formatted sources string; clients that render from raw_sources can set false to skip it"
+    )
 
 class Source(BaseModel):
     """Model for source information (video or PDF)"""
@@ -4,7 +4,8 @@ Service layer for conversation persistence.
 
 from __future__ import annotations
 
-from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Sequence, Tuple
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session, selectinload
@@ -53,23 +54,42 @@ class ConversationService:
 
     @staticmethod
     def add_message(db: Session, conversation: Conversation, role: str, content: str) -> Message:
-        if role not in ConversationService.VALID_ROLES:
-            raise ValueError(f"Invalid role '{role}'. Expected one of: {sorted(ConversationService.VALID_ROLES)}")
+        message = ConversationService.add_messages(db, conversation, [(role, content)])[0]
+        db.refresh(message)
+        return message
 
-        message = Message(
-            conversation_id=conversation.id,
-            role=role,
-            content=content,
-        )
-        db.add(message)
+    @staticmethod
+    def add_messages(
+        db: Session, conversation: Conversation, messages: Sequence[Tuple[str, str]]
+    ) -> List[Message]:
+        """Persist several (role, content) messages in one transaction, in order."""
+        for role, _ in messages:
+            if role not in ConversationService.VALID_ROLES:
+                raise ValueError(f"Invalid role '{role}'. Expected one of: {sorted(ConversationService.VALID_ROLES)}")
+
+        added: List[Message] = []
+        previous: Optional[datetime] = None
+        for role, content in messages:
+            # Stamp explicitly so messages written together still sort in insertion order.
+            created_at = datetime.now(timezone.utc)
+            if previous is not None and created_at <= previous:
+                created_at = previous + timedelta(microseconds=1)
+            previous = created_at
 
-        # Auto-title from first user message if still default.
-        if role == "user" and conversation.title == "New conversation":
-            stripped = content.strip().replace("\n", " ")
-            conversation.title = stripped[:80] if len(stripped) <= 80 else f"{stripped[:77]}..."
+            message = Message(
+                conversation_id=conversation.id,
+                role=role,
+                content=content,
+                created_at=created_at,
+            )
+            db.add(message)
+            added.append(message)
+
+            # Auto-title from first user message if still default.
+            if role == "user" and conversation.title == "New conversation":
+                stripped = content.strip().replace("\n", " ")
+                conversation.title = stripped[:80] if len(stripped) <= 80 else f"{stripped[:77]}..."
 
         db.commit()
-        db.refresh(message)
         db.refresh(conversation)
-        return message
-
+        return added
@@ -20,6 +20,26 @@ _WIKI_CAT_LABEL = {
     "sources": "source",
 }
 
+# Bot formatting patterns, compiled once at import
+_MD_HEADER_RE = re.compile(r'^(#{2,6}) (.+)$', re.MULTILINE)
+_DOC_REF_RE = re.compile(r'\[Document (\d+)\]', re.IGNORECASE)
+_VIDEO_ID_RE = re.compile(r'[A-Za-z0-9_-]{11}')
+
+_MONTH_NAMES = ('January', 'February', 'March', 'April', 'May', 'June', 'July',
+                'August', 'September', 'October', 'November', 'December')
+
+
+def _format_upload_date(year: str, month: str, day: str) -> str:
+    """'2024', '03', '05' -> 'March 05, 2024'; raises ValueError for an invalid date
+
+    Same result as strptime/strftime('%B %d, %Y') without the per-call format parsing.
+    """
+    if not (len(year) == 4 and 1 <= len(month) <= 2 and 1 <= len(day) <= 2
+            and (year + month + day).isascii() and (year + month + day).isdigit()):
+        raise ValueError(f"not a date: {year}-{month}-{day}")
+    date_obj = datetime(int(year), int(month), int(day))  # validates month/day ranges
+    return f"{_MONTH_NAMES[date_obj.month - 1]} {date_obj.day:02d}, {date_obj.year}"
+
 
 def _prettify_slug(slug: str) -> str:
     return slug.replace("-", " ").replace("_", " ").strip().title()
@@ -52,15 +72,14 @@ def render_wiki_references_html(refs: List[Dict[str, str]]) -> str:
     """Render the 'Wiki References' section (placed under Source References)."""
     if not refs:
         return ""
-    items = ""
-    for r in refs:
-        items += (
-            f'<a class="wiki-ref-link" href="{r["url"]}" target="_blank" rel="noopener noreferrer" '
-            f'title="Open the {r["label"]} wiki page in a new tab">'
-            f'<span class="wiki-ref-cat">{r["category"]}</span>'
-            f'<span class="wiki-ref-label">{r["label"]}</span>'
-            f'</a>'
-        )
+    items = "".join(
+        f'<a class="wiki-ref-link" href="{r["url"]}" target="_blank" rel="noopener noreferrer" '
+        f'title="Open the {r["label"]} wiki page in a new tab">'
+        f'<span class="wiki-ref-cat">{r["category"]}</span>'
+        f'<span class="wiki-ref-label">{r["label"]}</span>'
+        f'</a>'
+        for r in refs
+    )
     return (
         '<div class="source-section wiki-section">'
         f'<h4 class="section-title">🔗 Wiki References ({len(refs)})</h4>'
@@ -130,26 +149,27 @@ class HtmlFormatter:
         pdf_sources = [s for s in sources if s.get('source_type') == 'pdf']
         
         # Don't add outer wrapper - frontend will handle main container
-        sources_content = '<div class="video-references">'
+        # Collect the HTML pieces and join once at the end
+        sources_parts = ['<div class="video-references">']
         
         # Add informative header if we have highlights
         if quotes and len(quotes) > 0:
-            sources_content += '''
+            sources_parts.append('''
                 <div class="sources-header">
                     <h4>📚 Sources with Highlighted Quotes</h4>
                     <p>Key phrases from the AI's answer are <span class="highlight-legend">highlighted</span> in the snippets below for easy reference.</p>
                 </div>
-            '''
+            ''')
         
         # Create a new list to store sources with highlighted content
         highlighted_sources = []
         
         # Add video sources section if any exist
         if video_sources:
-            sources_content += f'''
+            sources_parts.append(f'''
                 <div class="source-section video-section">
                     <h4 class="section-title">🎬 Video Sources ({len(video_sources)})</h4>
-            '''
+            ''')
         
         for i, source in enumerate(video_sources):
             title = source.get('title', 'Untitled Video')
@@ -179,11 +199,9 @@ class HtmlFormatter:
             if upload_date != 'Unknown':
                 try:
                     if isinstance(upload_date, str) and len(upload_date) == 8:  # YYYYMMDD format
-                        date_obj = datetime.strptime(upload_date, '%Y%m%d')
-                        upload_date_formatted = date_obj.strftime('%B %d, %Y')
+                        upload_date_formatted = _format_upload_date(upload_date[:4], upload_date[4:6], upload_date[6:])
                     elif isinstance(upload_date, str) and '-' in upload_date:  # YYYY-MM-DD format
-                        date_obj = datetime.strptime(upload_date.split('T')[0], '%Y-%m-%d')
-                        upload_date_formatted = date_obj.strftime('%B %d, %Y')
+                        upload_date_formatted = _format_upload_date(*upload_date.split('T')[0].split('-'))
                     else:
                         upload_date_formatted = str(upload_date)
                 except:
@@ -213,7 +231,7 @@ class HtmlFormatter:
             metadata_html = ''.join(meta_items)
 
             # Create compact and professional video card HTML
-            sources_content += f'''
+            sources_parts.append(f'''
                 <div class="video-card">
                     <div class="video-card-header">
                         <a href='{video_url_with_timestamp}' target='_blank' class='video-title-link'>
@@ -239,7 +257,7 @@ class HtmlFormatter:
                         </div>
                     </div>
                 </div>
-            '''
+            ''')
             
             # Add this source to highlighted_sources with highlighted content
             source_with_highlighting = source.copy()
@@ -248,14 +266,14 @@ class HtmlFormatter:
         
         # Close video section if it was opened
         if video_sources:
-            sources_content += '</div>'  # Close video-section
+            sources_parts.append('</div>')  # Close video-section
         
         # Add PDF/Research Papers section if any exist
         if pdf_sources:
-            sources_content += f'''
+            sources_parts.append(f'''
                 <div class="source-section pdf-section">
                     <h4 class="section-title">📄 Research Papers ({len(pdf_sources)})</h4>
-            '''
+            ''')
             
             for source in pdf_sources:
                 title = source.get('title', 'Untitled Document')
@@ -290,7 +308,7 @@ class HtmlFormatter:
                 pdf_metadata_html = ''.join(pdf_meta_items) if pdf_meta_items else '<div class="metadata-item">Academic Paper</div>'
                 
                 # Create PDF card HTML
-                sources_content += f'''
+                sources_parts.append(f'''
                     <div class="video-card pdf-card">
                         <div class="video-card-header">
                             <span class="source-badge pdf-badge">PDF</span>
@@ -307,20 +325,21 @@ class HtmlFormatter:
                             </div>
                         </div>
                     </div>
-                '''
+                ''')
                 
                 # Add to highlighted sources
                 source_with_highlighting = source.copy()
                 source_with_highlighting['content'] = highlighted_content
                 highlighted_sources.append(source_with_highlighting)
             
-            sources_content += '</div>'  # Close pdf-section
+            sources_parts.append('</div>')  # Close pdf-section
         
         # Wiki References section — under the source cards, links open in a new tab.
         wiki_refs = collect_wiki_references(sources)
-        sources_content += render_wiki_references_html(wiki_refs)
+        sources_parts.append(render_wiki_references_html(wiki_refs))
 
-        sources_content += '</div>'  # Close video-references
+        sources_parts.append('</div>')  # Close video-references
+        sources_content = ''.join(sources_parts)
 
         return {
             "formatted_content": {
@@ -803,27 +822,19 @@ class BotFormatter:
         
         This ensures Discord gets proper **bold** formatting instead of raw #### syntax
         """
-        import re
+        # ## Header -> <h2>Header</h2> ... ###### Header -> <h6>Header</h6>
+        # One pass covers all five levels (same headers as HtmlFormatter)
+        def to_html(match):
+            level = len(match.group(1))
+            return f'<h{level}>{match.group(2)}</h{level}>'
         
-        # Convert markdown headers to HTML (same pattern as HtmlFormatter)
-        # ## Header -> <h2>Header</h2>
-        text = re.sub(r'^## (.+)$', r'<h2>\1</h2>', text, flags=re.MULTILINE)
-        # ### Header -> <h3>Header</h3>  
-        text = re.sub(r'^### (.+)$', r'<h3>\1</h3>', text, flags=re.MULTILINE)
-        # #### Header -> <h4>Header</h4>
-        text = re.sub(r'^#### (.+)$', r'<h4>\1</h4>', text, flags=re.MULTILINE)
-        # ##### Header -> <h5>Header</h5>
-        text = re.sub(r'^##### (.+)$', r'<h5>\1</h5>', text, flags=re.MULTILINE)
-        # ###### Header -> <h6>Header</h6>
-        text = re.sub(r'^###### (.+)$', r'<h6>\1</h6>', text, flags=re.MULTILINE)
-        
-        return text
+        return _MD_HEADER_RE.sub(to_html, text)
 
     def _improve_document_references(self, answer: str, sources: list) -> str:
         """Replace [Document N] references with Discord-friendly source links"""
         if not sources:
             # Remove any remaining document references if no sources available
-            answer = re.sub(r'\[Document \d+\]', '', answer, flags=re.IGNORECASE)
+            answer = _DOC_REF_RE.sub('', answer)
             return answer
         
         # Create a mapping of document numbers to source info
@@ -860,7 +871,7 @@ class BotFormatter:
                     timestamp_str = f" @ {minutes}:{seconds:02d}"
                 
                 # Clean up video ID titles
-                if len(title) == 11 and title.isalnum():  # Likely a video ID
+                if _VIDEO_ID_RE.fullmatch(title):  # Likely a video ID
                     title = source.get('filename', source.get('file_name', title))
                     title = title.replace('.mp3', '').replace('.wav', '').replace('.mp4', '')
                 
@@ -904,6 +915,6 @@ class BotFormatter:
                 return f"**[Source {doc_num}]**"
         
         # Replace [Document N] with source references
-        answer = re.sub(r'\[Document (\d+)\]', replace_doc_ref, answer, flags=re.IGNORECASE)
+        answer = _DOC_REF_RE.sub(replace_doc_ref, answer)
         
         return answer 
\ No newline at end of file
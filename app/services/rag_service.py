@@ -4,6 +4,7 @@ Contains all the core RAG processing logic
 """
 
 import os
+import asyncio
 import markdown
 from datetime import datetime
 from typing import List, Dict, Any, Optional
@@ -175,8 +176,11 @@ class RAGService:
                     },
                 }
             
-            # Format the response using the new formatter
-            formatted_result = self.formatter.format_response(
+            # Format the response using the new formatter. Markdown-to-HTML and
+            # source-card rendering is CPU-bound on long answers, so run it in a
+            # worker thread to keep the event loop free for concurrent requests.
+            formatted_result = await asyncio.to_thread(
+                self.formatter.format_response,
                 result.get('answer', ''),
                 result.get('sources', []),
                 format_type=format,
@@ -474,7 +478,11 @@ Current question: {query}"""
             
             # Get transcript content
             content = source.get('content', source.get('text', ''))
-            truncated_content = content[:200] + "..." if len(content) > 200 else content
+            # Cut long snippets at a word boundary; short ones are used as-is
+            if len(content) > 200:
+                truncated_content = content[:197].rsplit(' ', 1)[0] + "..."
+            else:
+                truncated_content = content
 
             meta_items = [
                 f'''<div class="metadata-item" title="Jump to timestamp in video"><svg xmlns='http://www.w3.org/2000/svg' width='14' height='14' viewBox='0 0 24 24' fill='none' stroke='#0f766e' stroke-width='2' stroke-linecap='round' stroke-linejoin='round'><circle cx='12' cy='12' r='10'></circle><polygon points='10 8 16 12 10 16 10 8'></polygon></svg><span>{timestamp_formatted}</span></div>''',
@@ -3,6 +3,8 @@
 Audio File Diagnostic Tool
 
 Check audio files for common issues that might cause transcription problems.
+Probes in-process with PyAV when it is installed (pip install av); otherwise
+falls back to one ffprobe subprocess per file.
 
 Usage:
     python3 check_audio_files.py [--fix] [--dir audio_files]
@@ -11,24 +13,63 @@ Usage:
 import os
 import subprocess
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import json
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import av
+    _HAVE_PYAV = True
+except ImportError:
+    _HAVE_PYAV = False
+
+# Probing is launch/IO-bound, so oversubscribe; ffmpeg re-encoding is CPU-bound
+PROBE_WORKERS = (os.cpu_count() or 1) * 2
+FIX_WORKERS = os.cpu_count() or 1
+
+def _probe_with_av(file_path):
+    """Read stream/format info in-process with PyAV (no ffprobe fork per file)"""
+    with av.open(str(file_path)) as container:
+        streams = [
+            # Data/attachment streams (e.g. an MP4 timecode track) have no codec context
+            {"codec_type": s.type, "codec_name": getattr(s.codec_context, "name", None)}
+            for s in container.streams
+        ]
+        duration = container.duration / av.time_base if container.duration else 0
+    return {
+        "streams": streams,
+        "format": {"duration": duration, "size": os.path.getsize(file_path)},
+    }
+
 def check_audio_file(file_path):
     """Check if an audio file is valid and get its properties"""
     try:
-        # Get detailed file information
-        cmd = [
-            'ffprobe', '-v', 'quiet', '-print_format', 'json',
-            '-show_format', '-show_streams', str(file_path)
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-        
-        if result.returncode != 0:
-            return {"valid": False, "error": "ffprobe failed", "details": result.stderr}
-        
-        info = json.loads(result.stdout)
+        if _HAVE_PYAV:
+            try:
+                info = _probe_with_av(file_path)
+            except av.error.FFmpegError as e:
+                return {"valid": False, "error": "pyav failed", "details": str(e)}
+        else:
+            # Ask ffprobe for only the fields used below
+            cmd = [
+                'ffprobe', '-v', 'quiet', '-print_format', 'json',
+                '-show_entries', 'stream=codec_type,codec_name:format=duration,size',
+                str(file_path)
+            ]
+            
+            # Keep stdout as bytes: both parsers accept them, so no utf-8 decode pass
+            result = subprocess.run(cmd, capture_output=True, timeout=10)
+            
+            if result.returncode != 0:
+                return {"valid": False, "error": "ffprobe failed", "details": result.stderr.decode(errors='replace')}
+            
+            info = _json_loads(result.stdout)
         
         # Check for audio streams
         audio_streams = [s for s in info.get('streams', []) if s.get('codec_type') == 'audio']
@@ -102,11 +143,16 @@ def main():
     
     # Find audio files
     input_dir = Path(args.dir)
-    extensions = args.extensions.split(',')
+    extensions = {'.' + ext.strip().lower() for ext in args.extensions.split(',') if ext.strip()}
     
+    # One directory scan, filtered by suffix in memory
     audio_files = []
-    for ext in extensions:
-        audio_files.extend(input_dir.glob(f"*.{ext}"))
+    if input_dir.is_dir():
+        with os.scandir(input_dir) as entries:
+            audio_files = sorted(
+                Path(entry.path) for entry in entries
+                if entry.is_file() and os.path.splitext(entry.name)[1].lower() in extensions
+            )
     
     if not audio_files:
         print(f"❌ No audio files found in {input_dir}")
@@ -114,15 +160,16 @@ def main():
     
     print(f" Checking {len(audio_files)} audio files...")
     
-    # Check each file
+    # Probe files concurrently; map() keeps results in input order for printing
+    with ThreadPoolExecutor(max_workers=PROBE_WORKERS) as executor:
+        results = list(executor.map(check_audio_file, audio_files))
+    
     valid_files = []
     problematic_files = []
     
-    for audio_file in audio_files:
+    for audio_file, result in zip(audio_files, results):
         print(f"📁 Checking {audio_file.name}...", end=" ")
         
-        result = check_audio_file(audio_file)
-        
         if result["valid"]:
             print("")
             valid_files.append((audio_file, result))
@@ -149,17 +196,21 @@ def main():
             fixed_dir = input_dir / "fixed"
             fixed_dir.mkdir(exist_ok=True)
             
-            for file_path, result in problematic_files:
-                if result.get('status') in ['VIDEO_FILE', 'NO_AUDIO']:
-                    print(f"  🔄 Fixing {file_path.name}...")
-                    output_file = fixed_dir / f"{file_path.stem}_fixed.mp3"
-                    
-                    success, error_msg = fix_audio_file(file_path, output_file)
-                    
-                    if success:
-                        print(f"     Fixed: {output_file}")
-                    else:
-                        print(f"    ❌ Failed: {error_msg[:100]}")
+            to_fix = [
+                (file_path, fixed_dir / f"{file_path.stem}_fixed.mp3")
+                for file_path, result in problematic_files
+                if result.get('status') in ['VIDEO_FILE', 'NO_AUDIO']
+            ]
+            
+            with ThreadPoolExecutor(max_workers=FIX_WORKERS) as executor:
+                fix_results = list(executor.map(lambda job: fix_audio_file(*job), to_fix))
+            
+            for (file_path, output_file), (success, error_msg) in zip(to_fix, fix_results):
+                print(f"  🔄 Fixing {file_path.name}...")
+                if success:
+                    print(f"     Fixed: {output_file}")
+                else:
+                    print(f"    ❌ Failed: {error_msg[:100]}")
     
     if valid_files:
         total_duration = sum(f[1]['duration'] for f in valid_files)
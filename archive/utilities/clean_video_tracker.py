@@ -6,20 +6,135 @@ This system tracks video processing state using only JSON files.
 No dummy files, no .note.txt files, just clean state management.
 """
 
+import functools
+import itertools
 import json
 import os
+import re
 import sys
+import time
+from collections import Counter
 from pathlib import Path
 from typing import Dict, List, Set
+import torch
 import whisper
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 
+try:
+    import orjson
+    _HAVE_ORJSON = True
+except ImportError:
+    _HAVE_ORJSON = False
+
+try:
+    import ijson
+    _HAVE_IJSON = True
+except ImportError:
+    _HAVE_IJSON = False
+
+def _json_loads(data: bytes):
+    return orjson.loads(data) if _HAVE_ORJSON else json.loads(data)
+
+def _json_dumps(obj, indent: bool = True) -> bytes:
+    if _HAVE_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
+
+def _iter_json_array(path):
+    """Yield the items of a top-level JSON array, streaming with ijson when installed"""
+    if _HAVE_IJSON:
+        with open(path, 'rb') as f:
+            yield from ijson.items(f, 'item')
+    else:
+        yield from _json_loads(Path(path).read_bytes())
+
+# Parsers for the legacy tracking files; each yields (url, title)
+def _parse_failed_urls(path):
+    with open(path, 'r') as f:
+        for line in f:
+            url = line.strip()
+            if url and url.startswith("http"):
+                yield url, "Unknown Title"
+
+def _parse_manual_needed(path):
+    for url in _iter_json_array(path):
+        if isinstance(url, str) and url.startswith("http"):
+            yield url, "Manual Processing Required"
+
+def _parse_missing_transcripts(path):
+    for item in _iter_json_array(path):
+        if isinstance(item, dict) and "url" in item:
+            yield item["url"], item.get("title", "Unknown Title")
+
+IMPORT_SOURCES = (
+    ("failed_video_urls.txt", _parse_failed_urls),
+    ("manual_processing_needed.json", _parse_manual_needed),
+    ("missing_transcripts.json", _parse_missing_transcripts),
+)
+
+def _make_record(video_id: str, url: str, title: str, source: str, now_iso: str) -> Dict:
+    return {
+        "url": url,
+        "title": title,
+        "status": "FAILED_DOWNLOAD",
+        "audio_file_path": f"audio_files/{video_id}.mp3",
+        "transcript_file_path": f"transcripts/{video_id}.txt",
+        "created": now_iso,
+        "last_updated": now_iso,
+        "source": source
+    }
+
+_VIDEO_ID_RE = re.compile(r"(?:v=|youtu\.be/)([A-Za-z0-9_-]{11})")
+
+@functools.lru_cache(maxsize=100_000)
+def extract_video_id(url: str) -> str:
+    """Extract video ID from YouTube URL (the same URLs recur across the import sources)"""
+    match = _VIDEO_ID_RE.search(url)
+    return match.group(1) if match else url.strip()
+
+# Error/placeholder transcripts start with one of these markers
+PLACEHOLDER_MARKERS = (b"DOWNLOAD FAILED", b"This transcript is a placeholder")
+TRANSCRIPT_HEAD_BYTES = 4096
+_HAVE_FADVISE = hasattr(os, "posix_fadvise")  # Linux/Unix only
+
+_model_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=1)
+def _load_whisper_model(model_name: str, device: str):
+    return whisper.load_model(model_name, device=device)
+
+def get_whisper_model(model_name: str, device: str):
+    """Load a Whisper model once per process and reuse it across process_transcripts calls"""
+    with _model_lock:
+        return _load_whisper_model(model_name, device)
+
+# Whisper model for CPU transcription worker processes (one per process)
+_worker_model = None
+
+def _init_transcribe_worker(model_name: str, threads: int):
+    global _worker_model
+    torch.set_num_threads(threads)
+    _worker_model = get_whisper_model(model_name, "cpu")
+
+def _transcribe_worker(audio_path: str) -> str:
+    return _worker_model.transcribe(audio_path, fp16=False)['text']
+
 class CleanVideoTracker:
     def __init__(self):
         self.base_dir = Path(".")
         self.audio_dir = self.base_dir / "audio_files"
         self.transcript_dir = self.base_dir / "transcripts"
         self.state_file = self.base_dir / "video_state.json"
+        # Append-only log of per-video updates since the last save_state()
+        self.journal_file = self.base_dir / "video_state.log"
+        self._journal = None
+        # CPU transcription workers, started on first use and kept for later calls
+        self._transcribe_pool = None
+        # (epoch seconds, isoformat string) of the last _now_iso() call
+        self._last_ts = (0.0, "")
         
         # Create directories if they don't exist
         self.audio_dir.mkdir(exist_ok=True)
@@ -28,15 +143,25 @@ class CleanVideoTracker:
         # Load or create state tracking
         self.state = self.load_state()
         
+    def _now_iso(self) -> str:
+        """Current time as an ISO string, reformatted at most once per second"""
+        now = time.time()
+        if now - self._last_ts[0] < 1.0:
+            return self._last_ts[1]
+        stamp = datetime.fromtimestamp(now).isoformat()
+        self._last_ts = (now, stamp)
+        return stamp
+    
     def load_state(self) -> Dict:
         """Load the video state from JSON file"""
         if self.state_file.exists():
-            with open(self.state_file, 'r') as f:
-                return json.load(f)
+            state = _json_loads(self.state_file.read_bytes())
+            self._replay_journal(state)
+            return state
         return {
             "videos": {},
             "metadata": {
-                "created": datetime.now().isoformat(),
+                "created": self._now_iso(),
                 "last_updated": None,
                 "total_videos": 0,
                 "completed": 0,
@@ -47,97 +172,77 @@ class CleanVideoTracker:
     
     def save_state(self):
         """Save the current state to JSON file"""
+        videos = self.state["videos"]
+        meta = self.state["metadata"]
+        
         # Update metadata
-        self.state["metadata"]["last_updated"] = datetime.now().isoformat()
-        self.state["metadata"]["total_videos"] = len(self.state["videos"])
+        meta["last_updated"] = self._now_iso()
+        meta["total_videos"] = len(videos)
         
         # Count statuses
-        status_counts = {}
-        for video_info in self.state["videos"].values():
-            status = video_info["status"]
-            status_counts[status] = status_counts.get(status, 0) + 1
+        status_counts = Counter(video_info["status"] for video_info in videos.values())
+        
+        meta["completed"] = status_counts["COMPLETED"]
+        meta["failed_downloads"] = status_counts["FAILED_DOWNLOAD"]
+        meta["pending_transcripts"] = status_counts["HAVE_AUDIO_NO_TRANSCRIPT"]
         
-        self.state["metadata"]["completed"] = status_counts.get("COMPLETED", 0)
-        self.state["metadata"]["failed_downloads"] = status_counts.get("FAILED_DOWNLOAD", 0)
-        self.state["metadata"]["pending_transcripts"] = status_counts.get("HAVE_AUDIO_NO_TRANSCRIPT", 0)
+        # Serialize in memory first so the file is written in one call
+        self.state_file.write_bytes(_json_dumps(self.state))
         
-        with open(self.state_file, 'w') as f:
-            json.dump(self.state, f, indent=2)
+        # The snapshot now includes every journaled update
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        self.journal_file.unlink(missing_ok=True)
+    
+    def journal_update(self, video_id: str, **changes):
+        """Apply changes to one video and append them to the journal
+        
+        Persists per-video progress with an O(1) append instead of rewriting the whole
+        state file; save_state() compacts the journal back into video_state.json.
+        """
+        self.state["videos"][video_id].update(changes)
+        if self._journal is None:
+            self._journal = open(self.journal_file, 'ab')
+        self._journal.write(_json_dumps({"id": video_id, **changes}, indent=False) + b"\n")
+        self._journal.flush()
+    
+    def _replay_journal(self, state: Dict):
+        """Fold updates left in the journal by an interrupted run into state"""
+        if not self.journal_file.exists():
+            return
+        with open(self.journal_file, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entry = _json_loads(line)
+                except ValueError:
+                    continue  # torn last line from a crash
+                video_id = entry.pop("id", None)
+                if video_id in state["videos"]:
+                    state["videos"][video_id].update(entry)
     
     def extract_video_id(self, url: str) -> str:
         """Extract video ID from YouTube URL"""
-        if "v=" in url:
-            return url.split("v=")[1].split("&")[0]
-        elif "youtu.be/" in url:
-            return url.split("youtu.be/")[1].split("?")[0]
-        return url.strip()
+        return extract_video_id(url)
     
     def import_failed_videos(self):
         """Import failed videos from existing tracking files into clean JSON state"""
         print("📥 Importing failed videos from existing files...")
         
         imported_count = 0
+        now_iso = self._now_iso()
+        videos = self.state["videos"]
         
-        # Import from failed_video_urls.txt
-        if os.path.exists("failed_video_urls.txt"):
-            with open("failed_video_urls.txt", 'r') as f:
-                for line in f:
-                    url = line.strip()
-                    if url and url.startswith("http"):
-                        video_id = self.extract_video_id(url)
-                        if video_id and video_id not in self.state["videos"]:
-                            self.state["videos"][video_id] = {
-                                "url": url,
-                                "title": "Unknown Title",
-                                "status": "FAILED_DOWNLOAD",
-                                "audio_file_path": f"audio_files/{video_id}.mp3",
-                                "transcript_file_path": f"transcripts/{video_id}.txt",
-                                "created": datetime.now().isoformat(),
-                                "last_updated": datetime.now().isoformat(),
-                                "source": "failed_video_urls.txt"
-                            }
-                            imported_count += 1
-        
-        # Import from manual_processing_needed.json
-        if os.path.exists("manual_processing_needed.json"):
-            with open("manual_processing_needed.json", 'r') as f:
-                manual_needed = json.load(f)
-                for url in manual_needed:
-                    if isinstance(url, str) and url.startswith("http"):
-                        video_id = self.extract_video_id(url)
-                        if video_id and video_id not in self.state["videos"]:
-                            self.state["videos"][video_id] = {
-                                "url": url,
-                                "title": "Manual Processing Required",
-                                "status": "FAILED_DOWNLOAD",
-                                "audio_file_path": f"audio_files/{video_id}.mp3",
-                                "transcript_file_path": f"transcripts/{video_id}.txt",
-                                "created": datetime.now().isoformat(),
-                                "last_updated": datetime.now().isoformat(),
-                                "source": "manual_processing_needed.json"
-                            }
-                            imported_count += 1
-        
-        # Import from missing_transcripts.json
-        if os.path.exists("missing_transcripts.json"):
-            with open("missing_transcripts.json", 'r') as f:
-                missing = json.load(f)
-                for item in missing:
-                    if isinstance(item, dict) and "url" in item:
-                        url = item["url"]
-                        video_id = self.extract_video_id(url)
-                        if video_id and video_id not in self.state["videos"]:
-                            self.state["videos"][video_id] = {
-                                "url": url,
-                                "title": item.get("title", "Unknown Title"),
-                                "status": "FAILED_DOWNLOAD",
-                                "audio_file_path": f"audio_files/{video_id}.mp3",
-                                "transcript_file_path": f"transcripts/{video_id}.txt",
-                                "created": datetime.now().isoformat(),
-                                "last_updated": datetime.now().isoformat(),
-                                "source": "missing_transcripts.json"
-                            }
-                            imported_count += 1
+        for source, parse in IMPORT_SOURCES:
+            if not os.path.exists(source):
+                continue
+            for url, title in parse(source):
+                video_id = self.extract_video_id(url)
+                if video_id and video_id not in videos:
+                    videos[video_id] = _make_record(video_id, url, title, source, now_iso)
+                    imported_count += 1
         
         print(f" Imported {imported_count} videos into clean tracking system")
         self.save_state()
@@ -147,43 +252,85 @@ class CleanVideoTracker:
         print(" Scanning existing files to update status...")
         
         updated_count = 0
+        now_iso = self._now_iso()
+        videos = self.state["videos"]
+        
+        # List each directory once up front instead of exists()/stat() per video
+        audio_entries = self._list_entries(self.audio_dir, ".mp3")
+        transcript_entries = self._list_entries(self.transcript_dir, ".txt")
         
-        for video_id, video_info in self.state["videos"].items():
+        for video_id, video_info in videos.items():
             old_status = video_info["status"]
-            new_status = self.determine_status(video_id)
+            new_status = self.determine_status(video_id, audio_entries, transcript_entries)
             
             if old_status != new_status:
                 video_info["status"] = new_status
-                video_info["last_updated"] = datetime.now().isoformat()
+                video_info["last_updated"] = now_iso
                 updated_count += 1
                 print(f" {video_id}: {old_status} → {new_status}")
         
         print(f" Updated status for {updated_count} videos")
         self.save_state()
     
-    def determine_status(self, video_id: str) -> str:
-        """Determine current status based on files that exist"""
+    @staticmethod
+    def _is_placeholder_transcript(path) -> bool:
+        """Check the head of a transcript for the error/placeholder markers
+        
+        whisper_transcribe.py writes the markers as the first lines, so reading a few KB
+        as bytes avoids decoding whole transcripts.
+        """
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            if _HAVE_FADVISE:
+                # Only the head is needed: disable readahead so the kernel does not
+                # pull in the following pages of large transcripts
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_RANDOM)
+            head = os.read(fd, TRANSCRIPT_HEAD_BYTES)
+        finally:
+            os.close(fd)
+        return any(marker in head for marker in PLACEHOLDER_MARKERS)
+    
+    @staticmethod
+    def _list_entries(directory: Path, suffix: str) -> Dict[str, os.DirEntry]:
+        """Map file stem -> DirEntry for every *suffix file, from one directory listing"""
+        entries = {}
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.endswith(suffix) and entry.is_file():
+                    entries[entry.name[:-len(suffix)]] = entry
+        return entries
+    
+    def determine_status(self, video_id: str, audio_entries: Dict[str, os.DirEntry] = None,
+                         transcript_entries: Dict[str, os.DirEntry] = None) -> str:
+        """Determine current status based on files that exist
+        
+        audio_entries/transcript_entries are optional _list_entries() snapshots; when
+        given, they replace the per-file existence checks.
+        """
         audio_file = self.audio_dir / f"{video_id}.mp3"
         transcript_file = self.transcript_dir / f"{video_id}.txt"
         
         # Check for real audio file (not dummy)
         has_real_audio = False
-        if audio_file.exists():
-            file_size = audio_file.stat().st_size
-            has_real_audio = file_size > 50000  # More than 50KB = real audio
+        if audio_entries is not None:
+            audio_entry = audio_entries.get(video_id)
+            audio_size = audio_entry.stat().st_size if audio_entry else None
+        else:
+            audio_size = audio_file.stat().st_size if audio_file.exists() else None
+        if audio_size is not None:
+            has_real_audio = audio_size > 50000  # More than 50KB = real audio
         
         # Check for real transcript (not error message)
         has_real_transcript = False
-        if transcript_file.exists():
+        if transcript_entries is not None:
+            transcript_entry = transcript_entries.get(video_id)
+            transcript_size = transcript_entry.stat().st_size if transcript_entry else None
+        else:
+            transcript_size = transcript_file.stat().st_size if transcript_file.exists() else None
+        if transcript_size is not None and transcript_size > 1000:
             try:
-                with open(transcript_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    has_real_transcript = (
-                        len(content) > 1000 and 
-                        "DOWNLOAD FAILED" not in content and
-                        "This transcript is a placeholder" not in content
-                    )
-            except:
+                has_real_transcript = not self._is_placeholder_transcript(transcript_file)
+            except OSError:
                 has_real_transcript = False
         
         # Determine status
@@ -202,30 +349,35 @@ class CleanVideoTracker:
         cleaned_transcripts = 0
         cleaned_notes = 0
         
+        # One listing of audio_files/ serves both the .mp3 and .note.txt passes
+        with os.scandir(self.audio_dir) as it:
+            audio_entries = [entry for entry in it if entry.is_file()]
+        
         # Remove dummy audio files (< 50KB)
-        for audio_file in self.audio_dir.glob("*.mp3"):
-            if audio_file.stat().st_size <= 50000:
-                print(f"🗑️  Removing dummy audio: {audio_file.name}")
-                audio_file.unlink()
+        for entry in audio_entries:
+            if entry.name.endswith(".mp3") and entry.stat().st_size <= 50000:
+                print(f"🗑️  Removing dummy audio: {entry.name}")
+                os.unlink(entry.path)
                 cleaned_audio += 1
         
         # Remove error transcript files
-        for transcript_file in self.transcript_dir.glob("*.txt"):
+        with os.scandir(self.transcript_dir) as it:
+            transcript_entries = [entry for entry in it if entry.name.endswith(".txt") and entry.is_file()]
+        for entry in transcript_entries:
             try:
-                with open(transcript_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    if "DOWNLOAD FAILED" in content or "This transcript is a placeholder" in content:
-                        print(f"🗑️  Removing error transcript: {transcript_file.name}")
-                        transcript_file.unlink()
-                        cleaned_transcripts += 1
-            except:
+                if self._is_placeholder_transcript(entry.path):
+                    print(f"🗑️  Removing error transcript: {entry.name}")
+                    os.unlink(entry.path)
+                    cleaned_transcripts += 1
+            except OSError:
                 pass
         
         # Remove .note.txt files
-        for note_file in self.audio_dir.glob("*.note.txt"):
-            print(f"🗑️  Removing note file: {note_file.name}")
-            note_file.unlink()
-            cleaned_notes += 1
+        for entry in audio_entries:
+            if entry.name.endswith(".note.txt"):
+                print(f"🗑️  Removing note file: {entry.name}")
+                os.unlink(entry.path)
+                cleaned_notes += 1
         
         print(f" Cleanup complete:")
         print(f"   🗑️  Dummy audio files: {cleaned_audio}")
@@ -254,10 +406,14 @@ class CleanVideoTracker:
     
     def list_videos_by_status(self, status: str, limit: int = 10):
         """List videos with specific status"""
-        matching = [
+        # Materialize only the rows that get printed; count the rest without storing them
+        matching = (
             (vid, info) for vid, info in self.state["videos"].items()
             if info["status"] == status
-        ]
+        )
+        limit = max(limit, 0)  # islice rejects negative counts
+        head = list(itertools.islice(matching, limit))
+        remaining = sum(1 for _ in matching) if len(head) == limit else 0
         
         status_names = {
             "FAILED_DOWNLOAD": "❌ Need Manual Download",
@@ -268,19 +424,19 @@ class CleanVideoTracker:
         print(f"\n{status_names.get(status, status)}")
         print("=" * 50)
         
-        if not matching:
+        if not head and not remaining:
             print(" No videos with this status")
             return
         
-        for i, (video_id, info) in enumerate(matching[:limit]):
+        for i, (video_id, info) in enumerate(head):
             title = info.get("title", "Unknown")[:60]
             print(f"{i+1:2d}. {video_id} - {title}")
             if status == "FAILED_DOWNLOAD":
                 print(f"    📥 URL: {info['url']}")
                 print(f"    💾 Save as: {info['audio_file_path']}")
         
-        if len(matching) > limit:
-            print(f"... and {len(matching) - limit} more")
+        if remaining:
+            print(f"... and {remaining} more")
     
     def export_download_list(self, filename: str = "clean_download_list.txt"):
         """Export download list without dummy files"""
@@ -289,14 +445,17 @@ class CleanVideoTracker:
             if info["status"] == "FAILED_DOWNLOAD"
         ]
         
+        lines = [
+            "# Clean Video Download List\n",
+            "# No dummy files - just real tracking!\n",
+            "# Format: VIDEO_ID | URL | SAVE_AS\n\n",
+        ]
+        for video_id, info in failed_videos:
+            title = info.get("title", "Unknown")[:40]
+            lines.append(f"{video_id} | {info['url']} | audio_files/{video_id}.mp3 | {title}\n")
+        
         with open(filename, 'w') as f:
-            f.write("# Clean Video Download List\n")
-            f.write("# No dummy files - just real tracking!\n")
-            f.write("# Format: VIDEO_ID | URL | SAVE_AS\n\n")
-            
-            for video_id, info in failed_videos:
-                title = info.get("title", "Unknown")[:40]
-                f.write(f"{video_id} | {info['url']} | audio_files/{video_id}.mp3 | {title}\n")
+            f.write("".join(lines))
         
         print(f"📋 Clean download list exported: {filename} ({len(failed_videos)} videos)")
     
@@ -314,11 +473,9 @@ class CleanVideoTracker:
         
         print(f"🎤 Processing transcripts for {len(video_ids)} videos...")
         
-        # Load Whisper model (using centralized config)
+        # Whisper settings (using centralized config)
         try:
-            from pipeline_config import WHISPER_MODEL
-            model = whisper.load_model(WHISPER_MODEL)
-            print(f" Whisper model '{WHISPER_MODEL}' loaded")
+            from pipeline_config import WHISPER_MODEL, PARALLEL_WORKERS
         except Exception as e:
             print(f"❌ Failed to load Whisper model: {e}")
             return
@@ -326,39 +483,80 @@ class CleanVideoTracker:
         successful = 0
         failed = 0
         
-        for i, video_id in enumerate(video_ids):
-            print(f"\n🎵 Processing {i+1}/{len(video_ids)}: {video_id}")
-            
+        jobs = []
+        for video_id in video_ids:
             audio_file = self.audio_dir / f"{video_id}.mp3"
-            transcript_file = self.transcript_dir / f"{video_id}.txt"
-            
             if not audio_file.exists():
                 print(f"❌ Audio file not found: {audio_file}")
                 failed += 1
                 continue
-            
+            jobs.append((video_id, str(audio_file)))
+        
+        if torch.cuda.is_available():
+            # A single GPU is the bottleneck: one fp16 model, files in sequence
             try:
-                # Transcribe with Whisper
-                result = model.transcribe(str(audio_file))
-                
-                # Save transcript
-                with open(transcript_file, 'w', encoding='utf-8') as f:
-                    f.write(result['text'])
-                
-                # Update state
-                self.state["videos"][video_id]["status"] = "COMPLETED"
-                self.state["videos"][video_id]["last_updated"] = datetime.now().isoformat()
-                
-                char_count = len(result['text'])
-                print(f" Transcript saved: {char_count} characters")
-                successful += 1
-                
+                model = get_whisper_model(WHISPER_MODEL, "cuda")
+                print(f" Whisper model '{WHISPER_MODEL}' ready on GPU")
             except Exception as e:
-                print(f"❌ Transcription failed: {e}")
-                failed += 1
-        
+                print(f"❌ Failed to load Whisper model: {e}")
+                return
+            
+            for i, (video_id, audio_path) in enumerate(jobs):
+                print(f"\n🎵 Processing {i+1}/{len(jobs)}: {video_id}")
+                try:
+                    text = model.transcribe(audio_path, fp16=True)['text']
+                    self._record_transcript(video_id, text)
+                    successful += 1
+                except Exception as e:
+                    print(f"❌ Transcription failed: {e}")
+                    failed += 1
+        elif jobs:
+            # CPU: one model per worker process, splitting the cores between them.
+            # The pool (and each worker's loaded model) is reused by later calls.
+            if self._transcribe_pool is None:
+                cpu_count = os.cpu_count() or 1
+                workers = max(1, min(PARALLEL_WORKERS, cpu_count // 2))
+                threads = max(1, cpu_count // workers)
+                print(f" Starting Whisper '{WHISPER_MODEL}' on CPU: {workers} workers x {threads} threads")
+                self._transcribe_pool = ProcessPoolExecutor(
+                    max_workers=workers, initializer=_init_transcribe_worker,
+                    initargs=(WHISPER_MODEL, threads)
+                )
+            
+            futures = {
+                self._transcribe_pool.submit(_transcribe_worker, audio_path): video_id
+                for video_id, audio_path in jobs
+            }
+            for i, future in enumerate(as_completed(futures)):
+                video_id = futures[future]
+                print(f"\n🎵 Finished {i+1}/{len(jobs)}: {video_id}")
+                try:
+                    self._record_transcript(video_id, future.result())
+                    successful += 1
+                except BrokenProcessPool as e:
+                    # A worker died (e.g. model failed to load); start a fresh pool next time
+                    print(f"❌ Transcription failed: {e}")
+                    self._transcribe_pool = None
+                    failed += 1
+                except Exception as e:
+                    print(f"❌ Transcription failed: {e}")
+                    failed += 1
+        
+        # Per-video progress is already durable via the journal; one snapshot at the end
+        # keeps the batch O(N) instead of rewriting the whole state file per video
         self.save_state()
         print(f"\n📊 Transcript processing complete: {successful} successful, {failed} failed")
+    
+    def _record_transcript(self, video_id: str, text: str):
+        """Write a finished transcript and mark the video completed"""
+        transcript_file = self.transcript_dir / f"{video_id}.txt"
+        with open(transcript_file, 'w', encoding='utf-8') as f:
+            f.write(text)
+        
+        # Journal the update so finished work survives an interrupted run
+        self.journal_update(video_id, status="COMPLETED", last_updated=self._now_iso())
+        
+        print(f" Transcript saved: {len(text)} characters")
 
 def main():
     tracker = CleanVideoTracker()
@@ -1,8 +1,12 @@
 import os
 import json
+import functools
+import threading
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import yt_dlp
-import pandas as pd
 from dotenv import load_dotenv
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
@@ -12,6 +16,29 @@ from pipeline_config import (
     CHANNEL_URLS, YOUTUBE_API_KEY
 )
 
+try:
+    import orjson
+    _HAVE_ORJSON = True
+except ImportError:
+    _HAVE_ORJSON = False
+
+def _json_loads(data: bytes):
+    return orjson.loads(data) if _HAVE_ORJSON else json.loads(data)
+
+def _write_json(path, obj, indent: bool = True):
+    """Write obj as JSON via a temp file and rename, so an interrupted run
+    never leaves a truncated file in place of the previous output."""
+    tmp_path = f"{path}.tmp"
+    if _HAVE_ORJSON:
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None))
+    else:
+        # Stream the encoder's chunks to the file instead of building the whole
+        # document as a str and then again as bytes
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(obj, f, indent=2 if indent else None, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -20,39 +47,30 @@ INPUT_JSON = VIDEOS_JSON
 OUTPUT_JSON = METADATA_JSON
 API_KEY = YOUTUBE_API_KEY
 
+# On-disk cache of YouTube API video details, so re-runs skip unchanged videos
+API_CACHE_FILE = Path("youtube_api_cache.json")
+API_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Standard watch, youtu.be and embed URLs in one alternation; fall back to any bare 11-character ID
+_VIDEO_URL_RE = re.compile(r'(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/)([A-Za-z0-9_-]{11})')
+# Splitting on non-ID characters yields the maximal ID-charset runs; an 11-character
+# run is exactly what a bounded [a-zA-Z0-9_-]{11} search would match
+_NON_ID_CHARS_RE = re.compile(r'[^a-zA-Z0-9_-]+')
+
+@functools.lru_cache(maxsize=100_000)
 def extract_video_id(url):
     """Extract video ID from YouTube URL."""
     if not url or not isinstance(url, str):
         return None
-        
-    # Match standard YouTube URL
-    if 'youtube.com/watch' in url:
-        # Extract video ID from v parameter
-        pattern = r'(?:youtube\.com\/watch\?v=|youtu\.be\/)([^&\s?]+)'
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-    
-    # Match youtu.be format
-    elif 'youtu.be' in url:
-        pattern = r'youtu\.be\/([^&\s?]+)'
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
     
-    # Match YouTube embed format
-    elif 'youtube.com/embed/' in url:
-        pattern = r'youtube\.com\/embed\/([^&\s?\/]+)'
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-    
-    # Last resort: try to find any 11-character ID in the URL
-    pattern = r'(?:^|[^a-zA-Z0-9_-])([a-zA-Z0-9_-]{11})(?:$|[^a-zA-Z0-9_-])'
-    match = re.search(pattern, url)
+    match = _VIDEO_URL_RE.search(url)
     if match:
         return match.group(1)
     
+    for token in _NON_ID_CHARS_RE.split(url):
+        if len(token) == 11:
+            return token
+    
     return None
 
 def get_transcript_info(video_id):
@@ -71,37 +89,74 @@ def get_transcript_info(video_id):
     
     for filename in possible_filenames:
         filepath = os.path.join(TRANSCRIPT_DIR, filename)
-        if os.path.exists(filepath):
-            transcript_info['transcript_path'] = filepath
-            transcript_info['transcript_creation_date'] = datetime.fromtimestamp(
-                os.path.getctime(filepath)).strftime('%Y-%m-%d')
-            
-            # Determine transcript method
-            if os.path.getsize(filepath) > 0:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    first_line = f.readline().strip()
-                    if first_line.endswith('s:'):
-                        transcript_info['transcript_method'] = 'Whisper'
-                    else:
-                        transcript_info['transcript_method'] = 'YouTube Captions'
-            break
+        # One stat() serves the existence check, ctime and size
+        try:
+            st = os.stat(filepath)
+        except FileNotFoundError:
+            continue
+        
+        transcript_info['transcript_path'] = filepath
+        transcript_info['transcript_creation_date'] = datetime.fromtimestamp(
+            st.st_ctime).strftime('%Y-%m-%d')
+        
+        # Determine transcript method
+        if st.st_size > 0:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                # Bounded read: a transcript may be one very long line
+                first_line = f.read(256).split('\n', 1)[0].strip()
+                if first_line.endswith('s:'):
+                    transcript_info['transcript_method'] = 'Whisper'
+                else:
+                    transcript_info['transcript_method'] = 'YouTube Captions'
+        break
     
     return transcript_info
 
+def _load_api_cache():
+    """Load cached API details ({video_id: {'fetched_at', 'data'}}); empty if missing or unreadable."""
+    if not API_CACHE_FILE.exists():
+        return {}
+    try:
+        return _json_loads(API_CACHE_FILE.read_bytes())
+    except ValueError:
+        return {}
+
+@functools.lru_cache(maxsize=1)
+def _youtube_client():
+    """YouTube Data API client, built once and reused (with its HTTP connection)."""
+    return build('youtube', 'v3', developerKey=API_KEY, cache_discovery=False)
+
 def get_video_details_from_youtube(video_ids):
-    """Fetch video details from YouTube API in batches."""
+    """Fetch video details from YouTube API in batches.
+    
+    Details fetched within API_CACHE_TTL_SECONDS are served from API_CACHE_FILE.
+    """
     if not API_KEY:
         print("No YouTube API key provided. Skipping API requests.")
         return {}
+    
+    cache = _load_api_cache()
+    now = time.time()
+    fresh = {
+        video_id: cache[video_id]['data']
+        for video_id in video_ids
+        if video_id in cache and now - cache[video_id]['fetched_at'] < API_CACHE_TTL_SECONDS
+    }
+    # A cached None means the API returned nothing for the ID (private/deleted video)
+    all_video_data = {video_id: data for video_id, data in fresh.items() if data is not None}
+    to_fetch = [video_id for video_id in video_ids if video_id not in fresh]
+    if fresh:
+        print(f"Using cached API details for {len(fresh)} videos")
+    if not to_fetch:
+        return all_video_data
         
-    youtube = build('youtube', 'v3', developerKey=API_KEY)
+    youtube = _youtube_client()
     
-    all_video_data = {}
     batch_size = 50  # YouTube API allows up to 50 IDs per request
     
     # Process in batches to respect API limits
-    for i in range(0, len(video_ids), batch_size):
-        batch = video_ids[i:i+batch_size]
+    for i in range(0, len(to_fetch), batch_size):
+        batch = to_fetch[i:i+batch_size]
         
         try:
             request = youtube.videos().list(
@@ -110,6 +165,10 @@ def get_video_details_from_youtube(video_ids):
             )
             response = request.execute()
             
+            # Remember IDs the API has no details for, so re-runs don't request them again
+            for video_id in batch:
+                cache[video_id] = {'fetched_at': now, 'data': None}
+            
             for item in response.get('items', []):
                 video_id = item['id']
                 snippet = item.get('snippet', {})
@@ -141,6 +200,7 @@ def get_video_details_from_youtube(video_ids):
                     'topics_tags': snippet.get('tags', []),
                     'thumbnail_url': snippet.get('thumbnails', {}).get('high', {}).get('url')
                 }
+                cache[video_id] = {'fetched_at': now, 'data': all_video_data[video_id]}
             
             print(f"Processed batch of {len(batch)} videos")
             
@@ -148,52 +208,63 @@ def get_video_details_from_youtube(video_ids):
             print(f"An HTTP error occurred: {e}")
             continue
     
+    # Write the cache once, after all batches
+    _write_json(API_CACHE_FILE, cache, indent=False)
+    
     return all_video_data
 
+VIDEO_YDL_OPTS = {
+    'skip_download': True,
+    'quiet': True,
+    'no_warnings': True,
+    'extract_flat': False,
+}
+
+_ydl_local = threading.local()
+
+def _video_ydl():
+    """Per-thread YoutubeDL, reused so its HTTP opener and cookies persist across videos."""
+    ydl = getattr(_ydl_local, 'ydl', None)
+    if ydl is None:
+        ydl = _ydl_local.ydl = yt_dlp.YoutubeDL(VIDEO_YDL_OPTS)
+    return ydl
+
 def get_video_details_from_yt_dlp(url, video_id):
     """Fetch additional details using yt-dlp."""
     if not url:
         return {}
         
-    ydl_opts = {
-        'skip_download': True,
-        'quiet': True,
-        'no_warnings': True,
-        'extract_flat': False,
-    }
-    
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-            
-            # Get the video_id from yt-dlp if available
-            extracted_id = info.get('id', video_id)
-            
-            # Extract guest names from title and description
-            guest_names = []
-            title = info.get('title', '')
-            description = info.get('description', '')
-            
-            # Basic guest detection (can be improved)
-            if 'with' in title or 'featuring' in title or 'ft.' in title:
-                guest_names.append('Guest mentioned in title')
-            
-            # Get available fields and ensure URL is correct
-            standard_url = f"https://www.youtube.com/watch?v={extracted_id}"
-            
-            return {
-                'video_id': extracted_id,
-                'title': title,
-                'url': standard_url,
-                'duration_seconds': info.get('duration'),
-                'upload_date': info.get('upload_date'),
-                'view_count': info.get('view_count'),
-                'description': description,
-                'guest_names': guest_names,
-                'likes': info.get('like_count'),
-                'channel_name': info.get('channel', info.get('uploader')),
-                'thumbnail_url': info.get('thumbnail')
-            }
+        info = _video_ydl().extract_info(url, download=False)
+        
+        # Get the video_id from yt-dlp if available
+        extracted_id = info.get('id', video_id)
+        
+        # Extract guest names from title and description
+        guest_names = []
+        title = info.get('title', '')
+        description = info.get('description', '')
+        
+        # Basic guest detection (can be improved)
+        if 'with' in title or 'featuring' in title or 'ft.' in title:
+            guest_names.append('Guest mentioned in title')
+        
+        # Get available fields and ensure URL is correct
+        standard_url = f"https://www.youtube.com/watch?v={extracted_id}"
+        
+        return {
+            'video_id': extracted_id,
+            'title': title,
+            'url': standard_url,
+            'duration_seconds': info.get('duration'),
+            'upload_date': info.get('upload_date'),
+            'view_count': info.get('view_count'),
+            'description': description,
+            'guest_names': guest_names,
+            'likes': info.get('like_count'),
+            'channel_name': info.get('channel', info.get('uploader')),
+            'thumbnail_url': info.get('thumbnail')
+        }
     except Exception as e:
         print(f"Error extracting info for {url}: {e}")
         return {
@@ -201,10 +272,40 @@ def get_video_details_from_yt_dlp(url, video_id):
             'url': f"https://www.youtube.com/watch?v={video_id}" if video_id else url
         }
 
+# yt-dlp channel listings are network-bound; a few concurrent requests stay
+# well under YouTube's rate limits
+YT_DLP_WORKERS = 8
+
+def _fetch_channel_entries(url, ydl_opts):
+    """List the videos of one channel URL with yt-dlp."""
+    print(f"Fetching videos from: {url}")
+    videos = []
+    try:
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            result = ydl.extract_info(url, download=False)
+            if 'entries' in result:
+                # Process each video entry
+                for entry in result['entries']:
+                    # Drop entries without an ID up front (they would become ...?v=None URLs)
+                    if entry and entry.get('id'):
+                        video_data = {
+                            'video_id': entry['id'],
+                            'url': f"https://www.youtube.com/watch?v={entry['id']}",
+                            'title': entry.get('title'),
+                            'upload_date': entry.get('upload_date'),  # yt-dlp format (YYYYMMDD if available)
+                            'duration': entry.get('duration'),
+                            'view_count': entry.get('view_count'),
+                            'description': entry.get('description'),
+                            'channel_name': entry.get('uploader') or entry.get('channel'),
+                        }
+                        videos.append(video_data)
+                print(f"Found {len(result['entries'])} videos in {url}")
+    except Exception as e:
+        print(f"Error fetching from {url}: {e}")
+    return videos
+
 def get_channel_videos(channel_urls):
     """Fetch all videos from channel URLs using yt-dlp."""
-    all_videos = []
-    
     # Use extract_flat for speed, but we'll enhance with API if available
     ydl_opts = {
         'extract_flat': 'in_playlist',  # Get more metadata than just 'True'
@@ -214,56 +315,31 @@ def get_channel_videos(channel_urls):
         'dateformat': '%Y%m%d',  # Format dates consistently
     }
     
-    for url in channel_urls:
-        print(f"Fetching videos from: {url}")
-        try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                result = ydl.extract_info(url, download=False)
-                if 'entries' in result:
-                    # Process each video entry
-                    for entry in result['entries']:
-                        if entry:
-                            video_data = {
-                                'video_id': entry.get('id'),
-                                'url': f"https://www.youtube.com/watch?v={entry.get('id')}",
-                                'title': entry.get('title'),
-                                'upload_date': entry.get('upload_date'),  # yt-dlp format (YYYYMMDD if available)
-                                'duration': entry.get('duration'),
-                                'view_count': entry.get('view_count'),
-                                'description': entry.get('description'),
-                                'channel_name': entry.get('uploader') or entry.get('channel'),
-                            }
-                            all_videos.append(video_data)
-                    print(f"Found {len(result['entries'])} videos in {url}")
-        except Exception as e:
-            print(f"Error fetching from {url}: {e}")
+    # Fetch channels concurrently; map() keeps results in channel order
+    all_videos = []
+    with ThreadPoolExecutor(max_workers=YT_DLP_WORKERS) as executor:
+        for videos in executor.map(lambda url: _fetch_channel_entries(url, dict(ydl_opts)), channel_urls):
+            all_videos.extend(videos)
     
     return all_videos
 
 def find_missing_transcripts(videos_data, transcript_dir="transcripts"):
     """Find videos that don't have transcripts."""
-    missing_transcripts = []
+    # List the directory once and test membership, instead of up to three
+    # os.path.exists() calls per video
+    existing = set(os.listdir(transcript_dir)) if os.path.isdir(transcript_dir) else set()
     
-    for video in videos_data:
+    def has_transcript(video):
         video_id = video['video_id']
-        transcript_exists = False
-        
         # Check different possible filenames
-        possible_filenames = [
+        possible_filenames = (
             f"{video_id}.txt",
             f"video_{video_id}.txt",
-            f"{video.get('title', '').replace(' ', '_')}.txt"
-        ]
-        
-        for filename in possible_filenames:
-            if os.path.exists(os.path.join(transcript_dir, filename)):
-                transcript_exists = True
-                break
-        
-        if not transcript_exists:
-            missing_transcripts.append(video)
+            f"{(video.get('title') or '').replace(' ', '_')}.txt"
+        )
+        return any(filename in existing for filename in possible_filenames)
     
-    return missing_transcripts
+    return [video for video in videos_data if not has_transcript(video)]
 
 def main():
     # Use centralized channel URLs from configuration
@@ -277,27 +353,24 @@ def main():
     # If we have a YouTube API key, enhance the metadata
     if API_KEY:
         print(" Enhancing metadata with YouTube API...")
-        video_ids = [video['video_id'] for video in all_videos if video.get('video_id')]
-        print(f"Getting enhanced metadata for {len(video_ids)} videos...")
+        # The same video can appear under several channel tabs; request each ID once
+        video_ids = list(dict.fromkeys(video['video_id'] for video in all_videos if video.get('video_id')))
+        print(f"Getting enhanced metadata for {len(video_ids)} unique videos...")
         
         enhanced_data = get_video_details_from_youtube(video_ids)
         
         # Merge enhanced data with basic data
         for video in all_videos:
-            video_id = video.get('video_id')
-            if video_id and video_id in enhanced_data:
+            enhanced_video = enhanced_data.get(video.get('video_id'))
+            if enhanced_video:
                 # Update with enhanced data, keeping existing data as fallback
-                enhanced_video = enhanced_data[video_id]
-                for key, value in enhanced_video.items():
-                    if value is not None:  # Only update if enhanced data has a value
-                        video[key] = value
+                video.update({key: value for key, value in enhanced_video.items() if value is not None})
         print(" Metadata enhancement complete")
     else:
         print("⚠️ No YouTube API key found - using basic yt-dlp metadata only")
     
     # Save all videos metadata
-    with open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
-        json.dump(all_videos, f, indent=2, ensure_ascii=False)
+    _write_json(OUTPUT_JSON, all_videos)
     print(f"Saved metadata for {len(all_videos)} videos to {OUTPUT_JSON}")
     
     # Find videos missing transcripts
@@ -306,8 +379,7 @@ def main():
     
     # Save missing transcripts list for whisper processing
     missing_transcripts_file = "missing_transcripts.json"
-    with open(missing_transcripts_file, 'w', encoding='utf-8') as f:
-        json.dump(missing_transcripts, f, indent=2, ensure_ascii=False)
+    _write_json(missing_transcripts_file, missing_transcripts)
     print(f"Saved {len(missing_transcripts)} videos needing transcription to {missing_transcripts_file}")
     
     # Create a script to process missing transcripts with whisper
@@ -324,8 +396,7 @@ def main():
         'failed': [video['url'] for video in missing_transcripts],
         'whisper_processed': []
     }
-    with open('transcript_progress.json', 'w') as f:
-        json.dump(progress_data, f, indent=2)
+    _write_json('transcript_progress.json', progress_data)
     
     print("\nNext steps:")
     print(f"1. Review the collected metadata in {OUTPUT_JSON}")
@@ -16,24 +16,9 @@ def convert_png_to_ico(png_path, ico_path):
         if img.mode != 'RGBA':
             img = img.convert('RGBA')
         
-        # Create different sizes for the favicon
+        # Save as ICO with multiple sizes; the ICO writer downsamples each size itself
         sizes = [16, 32, 48, 64]
-        
-        # Create a list to store all size variants
-        icon_images = []
-        
-        for size in sizes:
-            # Resize image maintaining aspect ratio
-            resized = img.resize((size, size), Image.Resampling.LANCZOS)
-            icon_images.append(resized)
-        
-        # Save as ICO with multiple sizes
-        icon_images[0].save(
-            ico_path,
-            format='ICO',
-            sizes=[(img.width, img.height) for img in icon_images],
-            append_images=icon_images[1:]
-        )
+        img.save(ico_path, format='ICO', sizes=[(size, size) for size in sizes])
         
         print(f"✅ Successfully converted {png_path} to {ico_path}")
         return True
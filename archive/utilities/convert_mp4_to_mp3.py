@@ -11,27 +11,55 @@ import sys
 import subprocess
 from pathlib import Path
 import glob
+from concurrent.futures import ThreadPoolExecutor
 
-def convert_mp4_to_mp3(mp4_file: Path, mp3_file: Path) -> bool:
-    """Convert a single MP4 file to MP3"""
+# ffmpeg threads per conversion when several run at once
+THREADS_PER_CONVERSION = 2
+
+def audio_codec(media_file: Path):
+    """Return the codec name of the first audio stream (e.g. 'mp3', 'aac'), or None"""
+    try:
+        result = subprocess.run(
+            ['ffprobe', '-v', 'error', '-select_streams', 'a:0',
+             '-show_entries', 'stream=codec_name', '-of', 'csv=p=0', str(media_file)],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+    except FileNotFoundError:
+        return None
+    codec = result.stdout.decode('utf-8', 'replace').strip()
+    return codec or None
+
+def convert_mp4_to_mp3(mp4_file: Path, mp3_file: Path, threads: int = 0) -> bool:
+    """Convert a single MP4 file to MP3 (threads=0 lets ffmpeg choose)
+    
+    An MP4 whose audio track is already MP3 has the stream copied out instead of re-encoded.
+    """
     try:
+        if audio_codec(mp4_file) == 'mp3':
+            audio_args = ['-c:a', 'copy']
+        else:
+            audio_args = ['-acodec', 'mp3', '-ab', '128k']  # Audio bitrate
+        
         cmd = [
-            'ffmpeg', '-i', str(mp4_file),
+            'ffmpeg', '-nostdin',
+            '-loglevel', 'error',  # Errors only, no per-frame progress on stderr
+            '-i', str(mp4_file),
             '-vn',  # No video
-            '-acodec', 'mp3',
-            '-ab', '128k',  # Audio bitrate
+            *audio_args,
+            '-threads', str(threads),
             '-y',  # Overwrite output file
             str(mp3_file)
         ]
         
-        # Run conversion
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        # Run conversion; only stderr is kept, for the failure message
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
         
         if result.returncode == 0:
             print(f" Converted: {mp4_file.name} → {mp3_file.name}")
             return True
         else:
-            print(f"❌ Failed to convert {mp4_file.name}: {result.stderr}")
+            error = result.stderr[-2048:].decode('utf-8', 'replace').strip()
+            print(f"❌ Failed to convert {mp4_file.name}: {error}")
             return False
             
     except Exception as e:
@@ -41,7 +69,7 @@ def convert_mp4_to_mp3(mp4_file: Path, mp3_file: Path) -> bool:
 def find_ffmpeg():
     """Check if ffmpeg is available"""
     try:
-        result = subprocess.run(['ffmpeg', '-version'], capture_output=True)
+        result = subprocess.run(['ffmpeg', '-version'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         return result.returncode == 0
     except FileNotFoundError:
         return False
@@ -70,13 +98,19 @@ def main():
     converted = 0
     failed = 0
     
-    for mp4_file in mp4_files:
-        # Create corresponding MP3 filename
-        mp3_file = mp4_file.with_suffix('.mp3')
-        
-        print(f"\n🔄 Converting: {mp4_file.name}")
-        
-        if convert_mp4_to_mp3(mp4_file, mp3_file):
+    def convert(mp4_file):
+        print(f"🔄 Converting: {mp4_file.name}")
+        return convert_mp4_to_mp3(mp4_file, mp4_file.with_suffix('.mp3'), threads=THREADS_PER_CONVERSION)
+    
+    # Each conversion is an independent ffmpeg process; run about one per two cores.
+    # Threads are enough here since the work happens in the subprocesses.
+    workers = max(1, (os.cpu_count() or 2) // THREADS_PER_CONVERSION)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(convert, mp4_files))
+    
+    # Remove originals here, once all conversions are back
+    for mp4_file, success in zip(mp4_files, results):
+        if success:
             converted += 1
             
             # Remove the original MP4 file
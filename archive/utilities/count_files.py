@@ -1,6 +1,28 @@
 import os
 import argparse
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# Directory scans to run at once in recursive mode
+SCAN_WORKERS = 16
+
+def _scan_dir(directory, file_type=None):
+    """Return (file_count, size_bytes, subdirectories) for a single directory level
+    
+    DirEntry answers is_dir/is_file from the listing and caches stat(), so each
+    counted file costs at most one stat call.
+    """
+    file_count = 0
+    size_bytes = 0
+    subdirs = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif entry.is_file() and (file_type is None or entry.name.endswith(file_type)):
+                file_count += 1
+                size_bytes += entry.stat().st_size
+    return file_count, size_bytes, subdirs
 
 def count_files(directory, recursive=False, file_type=None):
     """
@@ -14,25 +36,27 @@ def count_files(directory, recursive=False, file_type=None):
     Returns:
         tuple: (total_files, total_size_bytes)
     """
+    if not recursive:
+        total_files, total_size, _ = _scan_dir(directory, file_type)
+        return total_files, total_size
+    
     total_files = 0
     total_size = 0
     
-    if recursive:
-        # Walk through directory and subdirectories
-        for root, _, files in os.walk(directory):
-            for file in files:
-                if file_type is None or file.endswith(file_type):
-                    file_path = os.path.join(root, file)
-                    total_files += 1
-                    total_size += os.path.getsize(file_path)
-    else:
-        # Count only files in the specified directory
-        for file in os.listdir(directory):
-            file_path = os.path.join(directory, file)
-            if os.path.isfile(file_path):
-                if file_type is None or file.endswith(file_type):
-                    total_files += 1
-                    total_size += os.path.getsize(file_path)
+    # Scan subdirectories concurrently as they are discovered; scandir/stat release
+    # the GIL, so threads overlap the filesystem latency
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+        pending = {executor.submit(_scan_dir, directory, file_type)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    files, size, subdirs = future.result()
+                except OSError:
+                    continue  # Unreadable directory: skipped, as os.walk does
+                total_files += files
+                total_size += size
+                pending.update(executor.submit(_scan_dir, subdir, file_type) for subdir in subdirs)
     
     return total_files, total_size
 
@@ -164,7 +164,7 @@ def test_search(index, texts, metadatas, model_name=MODEL_NAME, top_k=5):
         print(f"\nTest Query: '{query}'")
         
         # Create embedding for query
-        query_embedding = model.encode([query])[0].reshape(1, -1).astype('float32')
+        query_embedding = model.encode([query], convert_to_numpy=True)
         
         # Search the index
         distances, indices = index.search(query_embedding, top_k)
@@ -1,7 +1,6 @@
 import os
 import faiss
 import pickle
-import numpy as np
 from sentence_transformers import SentenceTransformer
 
 # Configuration
@@ -46,7 +45,7 @@ def search_transcripts(query, top_k=TOP_K, model_name=MODEL_NAME):
     
     # Load model and create query embedding
     model = SentenceTransformer(model_name)
-    query_embedding = model.encode([query])[0].reshape(1, -1).astype('float32')
+    query_embedding = model.encode([query], convert_to_numpy=True)
     
     # Search the index
     distances, indices = index.search(query_embedding, top_k)
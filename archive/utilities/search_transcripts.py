@@ -2,7 +2,6 @@ import os
 import argparse
 import faiss
 import pickle
-import numpy as np
 from sentence_transformers import SentenceTransformer
 
 # Configuration
@@ -41,7 +40,7 @@ def search(query, index, metadatas, model_name=MODEL_NAME, top_k=TOP_K, show_tex
     # Load model and create query embedding
     print("Loading model and creating query embedding...")
     model = SentenceTransformer(model_name)
-    query_embedding = model.encode([query])[0].reshape(1, -1).astype('float32')
+    query_embedding = model.encode([query], convert_to_numpy=True)
     
     # Search the index
     print(f"Searching index with {index.ntotal} vectors...")
@@ -6,10 +6,11 @@ This helper is intentionally simple so any bot framework can wrap it.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 
 @dataclass
@@ -19,15 +20,39 @@ class OpteeeClient:
     The wiki methods mirror the REST endpoints documented in README.md and
     bots/README.md so downstream Telegram/Slack/webhook integrations can drill
     from chat results into the synthesized knowledge layer.
+
+    Requests go through one ``requests.Session`` so repeat calls reuse the
+    kept-alive connection (no new DNS lookup, TCP or TLS handshake per call).
+    Call ``close()`` or use the client as a context manager when done.
+    Raise ``pool_maxsize`` when one client is shared by more threads than
+    that, otherwise connections beyond the pool are opened and thrown away.
     """
 
     base_url: str
     provider: str = "claude"
     num_results: int = 5
     timeout_seconds: int = 30
+    pool_maxsize: int = 10
+    session: requests.Session = field(
+        default_factory=requests.Session, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        adapter = HTTPAdapter(pool_maxsize=self.pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "OpteeeClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
     def _get(self, path: str, **params: Any) -> dict:
-        response = requests.get(
+        response = self.session.get(
             f"{self.base_url}{path}",
             params={k: v for k, v in params.items() if v is not None},
             timeout=self.timeout_seconds,
@@ -36,7 +61,7 @@ class OpteeeClient:
         return response.json()
 
     def _post(self, path: str, payload: dict) -> dict:
-        response = requests.post(
+        response = self.session.post(
             f"{self.base_url}{path}",
             json=payload,
             timeout=self.timeout_seconds,
@@ -87,24 +112,24 @@ class OpteeeClient:
 
 
 if __name__ == "__main__":
-    client = OpteeeClient(base_url="http://localhost:7860")
-    print("Health:", client.health())
-
-    conv_id = client.create_conversation()
-    print("Conversation ID:", conv_id)
-
-    first = client.chat("What is gamma in options trading?", conversation_id=conv_id)
-    print("Answer 1:", first["answer"][:300], "...")
-    print("Wiki refs:", [ref.get("path") for ref in first.get("wiki_references", [])])
-
-    for expanded in client.expand_chat_with_wiki(first)[:2]:
-        page = expanded["page"]
-        print(
-            "Wiki page:",
-            expanded["reference"].get("path"),
-            "title=",
-            page.get("frontmatter", {}).get("title"),
-        )
-
-    second = client.chat("How does that affect risk?", conversation_id=conv_id)
-    print("Answer 2:", second["answer"][:300], "...")
+    with OpteeeClient(base_url="http://localhost:7860") as client:
+        print("Health:", client.health())
+
+        conv_id = client.create_conversation()
+        print("Conversation ID:", conv_id)
+
+        first = client.chat("What is gamma in options trading?", conversation_id=conv_id)
+        print("Answer 1:", first["answer"][:300], "...")
+        print("Wiki refs:", [ref.get("path") for ref in first.get("wiki_references", [])])
+
+        for expanded in client.expand_chat_with_wiki(first)[:2]:
+            page = expanded["page"]
+            print(
+                "Wiki page:",
+                expanded["reference"].get("path"),
+                "title=",
+                page.get("frontmatter", {}).get("title"),
+            )
+
+        second = client.chat("How does that affect risk?", conversation_id=conv_id)
+        print("Answer 2:", second["answer"][:300], "...")
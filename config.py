@@ -1,8 +1,14 @@
 import os
 from pathlib import Path
 
-# Detect whether we're running from the packaged /app layout or the local repo
-IS_APP_LAYOUT = os.path.exists('/app') and os.path.ismount('/app')
+# Detect whether we're running from the packaged /app layout or the local repo.
+# OPTEEE_APP_LAYOUT=1/0 settles it without touching the filesystem; otherwise
+# fall back to checking for a mounted /app.
+_app_layout_env = os.getenv('OPTEEE_APP_LAYOUT')
+if _app_layout_env is not None:
+    IS_APP_LAYOUT = _app_layout_env.strip() == '1'
+else:
+    IS_APP_LAYOUT = os.path.exists('/app') and os.path.ismount('/app')
 IS_LOCAL = not IS_APP_LAYOUT
 
 if IS_APP_LAYOUT:
@@ -22,10 +28,13 @@ PROCESSED_TRANSCRIPTS_PATH = PROCESSED_DIR
 MODEL_NAME = "all-MiniLM-L6-v2"
 DEVICE = "cpu"  # Use "cuda" if GPU is available
 
-# Whisper-specific device detection
-import torch
-WHISPER_DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
-print(f"Whisper will use device: {WHISPER_DEVICE}")
+# Whisper-specific device detection is resolved on first access (PEP 562), so
+# importing config does not pull in torch for scripts that never transcribe
+def __getattr__(name):
+    if name == "WHISPER_DEVICE":
+        import torch
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Search configuration
 TOP_K = 5
@@ -39,10 +48,6 @@ BATCH_SIZE = 32
 try:
     Path(PROCESSED_DIR).mkdir(exist_ok=True, parents=True)
     Path(VECTOR_DIR).mkdir(exist_ok=True, parents=True)
-    
-    # Create directories if they don't exist
-    for directory in [PROCESSED_DIR, VECTOR_DIR]:
-        os.makedirs(directory, exist_ok=True)
 except (OSError, PermissionError) as e:
     print(f"Warning: Could not create directories: {e}")
     print(f"Processed dir: {PROCESSED_DIR}")
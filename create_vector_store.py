@@ -1,10 +1,18 @@
 import os
 import json
+import math
+import hashlib
 import numpy as np
 from tqdm import tqdm
 import faiss
 import pickle
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # Set up environment variables for model caching before importing SentenceTransformer  
 # Use local cache paths for development, /app paths for deployment
 cache_base = '/app/cache' if os.path.exists('/app') else os.path.expanduser('~/.cache')
@@ -12,16 +20,72 @@ os.environ.setdefault('TRANSFORMERS_CACHE', f'{cache_base}/huggingface')
 os.environ.setdefault('SENTENCE_TRANSFORMERS_HOME', f'{cache_base}/sentence_transformers')
 os.environ.setdefault('HF_HOME', f'{cache_base}/huggingface')
 
+import torch
 from sentence_transformers import SentenceTransformer
 import argparse
-from pipeline_config import PROCESSED_DIR, VECTOR_STORE_DIR, BATCH_SIZE
+from pipeline_config import PROCESSED_DIR, VECTOR_STORE_DIR, BATCH_SIZE, FAISS_INDEX_FACTORY
 
 # Use the correct directory paths from pipeline_config
 MODEL_NAME = "all-MiniLM-L6-v2"
 
+# Pre-quantized int8 ONNX export published with the model on the Hugging Face Hub
+ONNX_MODEL_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+BACKENDS = ('torch', 'onnx')
+
 # Global variable to allow override of vector store directory
 VECTOR_OUTPUT_DIR = VECTOR_STORE_DIR
 
+# Embeddings reused across builds; kept out of vector_store/, which is committed
+EMBEDDING_CACHE_DIR = os.getenv('OPTEEE_EMBEDDING_CACHE_DIR', f'{cache_base}/opteee_embeddings')
+
+# --index-type presets, translated into index_factory specs by index_factory_for()
+INDEX_TYPES = ('flat', 'ivfpq', 'hnsw')
+# IVF lists probed per query in test_search (matches rag_pipeline's default)
+IVF_NPROBE = 16
+
+def index_factory_for(index_type, num_vectors):
+    """Return the faiss.index_factory spec for an --index-type preset.
+    
+    ivfpq sizes the coarse quantizer to the corpus (nlist ~ 4*sqrt(N)) and stores
+    16-byte PQ codes per vector.
+    """
+    if index_type == 'flat':
+        return "Flat"
+    if index_type == 'hnsw':
+        return "HNSW32"
+    if index_type == 'ivfpq':
+        nlist = max(1, int(4 * math.sqrt(num_vectors)))
+        return f"IVF{nlist},PQ16"
+    raise ValueError(f"Unknown index type: {index_type}")
+
+# --precision choices for the stored vectors
+PRECISIONS = ('fp32', 'fp16', 'int8', 'binary')
+# Scalar-quantizer codes used for the reduced-precision options
+_SQ_CODES = {'fp16': 'SQfp16', 'int8': 'SQ8'}
+# Binary search over-fetches this many candidates per result before float rescoring
+BINARY_RESCORE_FACTOR = 4
+
+def apply_precision(index_factory, precision):
+    """Swap the vector storage of an index_factory spec for the requested precision.
+    
+    fp16 halves the stored vectors and int8 (SQ8) quarters them; L2 distances stay on
+    the same scale, so the retriever is unaffected. Specs that already compress
+    vectors (PQ) are rejected.
+    """
+    if precision in ('fp32', 'binary'):
+        # binary adds a separate Hamming index (create_binary_index); the served one stays fp32
+        return index_factory
+    if precision not in _SQ_CODES:
+        raise ValueError(f"Unknown precision: {precision}")
+    code = _SQ_CODES[precision]
+    if index_factory == 'Flat':
+        return code
+    if index_factory.endswith(',Flat'):
+        return index_factory[:-len('Flat')] + code
+    if index_factory.startswith('HNSW') and ',' not in index_factory:
+        return f"{index_factory}_{code}"
+    raise ValueError(f"{precision} precision does not apply to index spec '{index_factory}'")
+
 def load_processed_transcripts():
     """Load all processed transcript chunks from JSON files"""
     print(f"Loading processed transcripts from {PROCESSED_DIR}...")
@@ -39,9 +103,9 @@ def load_processed_transcripts():
     for filename in tqdm(json_files, desc="Loading files"):
         try:
             file_path = os.path.join(PROCESSED_DIR, filename)
-            with open(file_path, 'r', encoding='utf-8') as f:
+            with open(file_path, 'rb') as f:
                 # The file now contains a list of chunks
-                video_chunks = json.load(f)
+                video_chunks = _json_loads(f.read())
                 
                 for chunk in video_chunks:
                     text = chunk.get('text', '')
@@ -65,8 +129,8 @@ def load_processed_transcripts():
         for filename in tqdm(pdf_files, desc="Loading PDF files"):
             try:
                 file_path = os.path.join(pdf_dir, filename)
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    pdf_chunks = json.load(f)
+                with open(file_path, 'rb') as f:
+                    pdf_chunks = _json_loads(f.read())
                     
                 for chunk in pdf_chunks:
                     text = chunk.get('text', '')
@@ -85,38 +149,192 @@ def load_processed_transcripts():
     print(f"\n📊 TOTAL: {len(all_chunks)} chunks (transcripts + PDFs)")
     return all_chunks, all_metadatas
 
-def create_embeddings(texts, model_name=MODEL_NAME, batch_size=BATCH_SIZE):
-    """Create embeddings for all texts using the specified model"""
-    print(f"\nLoading embedding model: {model_name}")
-    model = SentenceTransformer(model_name)
+def load_model(model_name=MODEL_NAME, backend='torch'):
+    """Load the encoder; backend='onnx' runs the int8 ONNX export on ONNX Runtime.
+    
+    The PyTorch model runs in fp16 on CUDA when a GPU is available.
+    
+    The ONNX path needs sentence-transformers>=3.2 with onnxruntime/optimum installed;
+    if it cannot be loaded, fall back to the regular PyTorch model.
+    """
+    if backend == 'onnx':
+        try:
+            return SentenceTransformer(model_name, backend="onnx", model_kwargs={"file_name": ONNX_MODEL_FILE})
+        except Exception as e:
+            print(f"ℹ️  ONNX backend unavailable ({e}); using PyTorch")
+    if torch.cuda.is_available():
+        # fp16 on the GPU; encode() then returns float16 arrays, so callers cast them
+        # to float32 before they reach FAISS
+        return SentenceTransformer(model_name, device='cuda').half()
+    return SentenceTransformer(model_name)
+
+def compile_model(model):
+    """Compile the PyTorch transformer with torch.compile and warm it up
+    
+    dynamic=True avoids a recompile for every new padded sequence length. Falls back to
+    the eager model if compilation is unavailable.
+    """
+    try:
+        model[0].auto_model = torch.compile(model[0].auto_model, dynamic=True)
+        model.encode(["warm-up"], show_progress_bar=False)  # Compile before the timed loop
+        print(" Encoder compiled with torch.compile")
+    except Exception as e:
+        print(f"ℹ️  torch.compile unavailable ({e}); using eager mode")
+    return model
+
+def create_embeddings(texts, model, batch_size=BATCH_SIZE, workers=1):
+    """Create embeddings for all texts with an already-loaded model (see load_model)
+    
+    workers > 1 shards the batches across that many processes, each with its own
+    model copy: one per GPU (round-robin) when CUDA is available, otherwise CPU
+    processes with an equal share of the cores.
+    """
+    # Repeated boilerplate (intros, disclaimers) is encoded once and the vector shared;
+    # every input row still gets its own embedding row
+    unique_texts = list(dict.fromkeys(texts))
+    if len(unique_texts) < len(texts):
+        print(f" {len(texts) - len(unique_texts)} duplicate chunks will reuse an identical chunk's embedding")
+        unique_embeddings = create_embeddings(unique_texts, model, batch_size=batch_size, workers=workers)
+        position = {text: i for i, text in enumerate(unique_texts)}
+        return unique_embeddings[[position[text] for text in texts]]
     
     print(f"Creating embeddings for {len(texts)} chunks (batch size: {batch_size})...")
-    embeddings = []
+    embeddings = None
+    
+    # Batch texts of similar length together so each batch pads to less;
+    # each batch is written straight back to its texts' original rows
+    order = np.argsort([len(t) for t in texts], kind='stable')
+    sorted_texts = [texts[i] for i in order]
     
-    # Process in batches to avoid memory issues
-    for i in tqdm(range(0, len(texts), batch_size), desc="Creating embeddings"):
-        batch_texts = texts[i:i+batch_size]
-        batch_embeddings = model.encode(batch_texts, show_progress_bar=False)
-        embeddings.extend(batch_embeddings)
+    if workers > 1:
+        if torch.cuda.is_available():
+            devices = [f'cuda:{i % torch.cuda.device_count()}' for i in range(workers)]
+        else:
+            # Workers read OMP_NUM_THREADS when they import torch; split the cores so the
+            # processes don't oversubscribe them
+            os.environ.setdefault('OMP_NUM_THREADS', str(max(1, (os.cpu_count() or 1) // workers)))
+            devices = ['cpu'] * workers
+        pool = model.start_multi_process_pool(devices)
+        try:
+            sorted_embeddings = model.encode_multi_process(sorted_texts, pool, batch_size=batch_size)
+        finally:
+            model.stop_multi_process_pool(pool)
+        embeddings = np.empty(sorted_embeddings.shape, dtype=np.float32)
+        embeddings[order] = sorted_embeddings
+    else:
+        # Process in batches to avoid memory issues, filling one preallocated
+        # float32 array instead of collecting rows and copying them at the end
+        # (this also upcasts the fp16 model's float16 output)
+        for i in tqdm(range(0, len(sorted_texts), batch_size), desc="Creating embeddings"):
+            batch_texts = sorted_texts[i:i+batch_size]
+            batch_embeddings = model.encode(batch_texts, show_progress_bar=False, convert_to_numpy=True)
+            if embeddings is None:
+                embeddings = np.empty((len(texts), batch_embeddings.shape[1]), dtype=np.float32)
+            embeddings[order[i:i+len(batch_texts)]] = batch_embeddings
     
-    embeddings = np.array(embeddings).astype('float32')
+    if embeddings is None:
+        embeddings = np.empty((0, 0), dtype=np.float32)
     print(f" Created embeddings with shape: {embeddings.shape}")
     return embeddings
 
-def create_faiss_index(embeddings, metadatas, texts):
-    """Create and save a FAISS index for fast similarity search"""
+def _embedding_cache_paths():
+    return (os.path.join(EMBEDDING_CACHE_DIR, "embedding_cache_keys.npy"),
+            os.path.join(EMBEDDING_CACHE_DIR, "embedding_cache.npy"))
+
+def embedding_cache_key(model_name, backend, model):
+    """Cache key for create_embeddings_cached: model, runtime, device type and dtype
+    
+    fp16 CUDA vectors and fp32 CPU vectors differ slightly, so they are cached apart.
+    """
+    device = torch.device(getattr(model, 'device', 'cpu')).type
+    parameters = model.parameters() if hasattr(model, 'parameters') else iter(())
+    dtype = next((str(p.dtype).replace('torch.', '') for p in parameters), 'none')
+    return f"{model_name}|{backend}|{device}|{dtype}"
+
+def create_embeddings_cached(texts, model, cache_key, batch_size=BATCH_SIZE, workers=1):
+    """Create embeddings, reusing vectors cached by a previous run for unchanged texts
+    
+    Entries are keyed by a hash of cache_key (see embedding_cache_key) plus the chunk text, so
+    only new or edited chunks are encoded. The cache is rewritten to hold exactly the
+    current texts, so it does not grow across rebuilds.
+    """
+    prefix = f"{cache_key}\0".encode('utf-8')
+    digests = [hashlib.blake2b(prefix + t.encode('utf-8'), digest_size=16).digest() for t in texts]
+    
+    keys_path, vectors_path = _embedding_cache_paths()
+    cached_rows, cached_vectors = {}, None
+    if os.path.exists(keys_path) and os.path.exists(vectors_path):
+        cached_vectors = np.load(vectors_path, mmap_mode='r')
+        cached_rows = {key.tobytes(): row for row, key in enumerate(np.load(keys_path))}
+    
+    misses = [i for i, digest in enumerate(digests) if digest not in cached_rows]
+    print(f" Embedding cache: {len(texts) - len(misses)} reused, {len(misses)} to encode")
+    if misses:
+        new_embeddings = create_embeddings([texts[i] for i in misses], model, batch_size=batch_size, workers=workers)
+        dimension = new_embeddings.shape[1]
+    elif cached_vectors is not None:
+        dimension = cached_vectors.shape[1]
+    else:
+        return np.empty((0, 0), dtype=np.float32)  # No texts at all
+    
+    embeddings = np.empty((len(texts), dimension), dtype=np.float32)
+    hits = [i for i, digest in enumerate(digests) if digest in cached_rows]
+    if hits:
+        embeddings[hits] = cached_vectors[[cached_rows[digests[i]] for i in hits]]
+    if misses:
+        embeddings[misses] = new_embeddings
+    
+    # Replace (not overwrite) the files: the old vectors may still be memory-mapped
+    os.makedirs(EMBEDDING_CACHE_DIR, exist_ok=True)
+    # Keys are stored as raw uint8 rows; an 'S16' array would strip trailing NUL bytes
+    keys = np.frombuffer(b''.join(digests), dtype=np.uint8).reshape(len(digests), 16)
+    for path, array in ((keys_path, keys), (vectors_path, embeddings)):
+        with open(f"{path}.tmp", 'wb') as f:
+            np.save(f, array)
+        os.replace(f"{path}.tmp", path)
+    return embeddings
+
+def to_gpu(index):
+    """Return a copy of index on all GPUs when faiss-gpu and a GPU are available, else None
+    
+    HNSW has no GPU implementation; such indexes stay on the CPU.
+    """
+    if not hasattr(faiss, 'StandardGpuResources') or faiss.get_num_gpus() == 0:
+        return None
+    try:
+        return faiss.index_cpu_to_all_gpus(index)
+    except RuntimeError as e:
+        print(f"ℹ️  Keeping index on CPU ({e})")
+        return None
+
+def create_faiss_index(embeddings, metadatas, texts, index_factory=FAISS_INDEX_FACTORY):
+    """Create and save a FAISS index for fast similarity search
+
+    index_factory is a faiss.index_factory spec ("HNSW32", "IVF4096,PQ64", "Flat").
+    The index keeps the L2 metric so retriever scores remain distances (lower is better).
+    """
     # Create directory for vector store if it doesn't exist
     os.makedirs(VECTOR_OUTPUT_DIR, exist_ok=True)
     
     # Get dimension of embeddings
     dimension = embeddings.shape[1]
-    print(f"\nCreating FAISS index with dimension {dimension}...")
+    print(f"\nCreating FAISS index ({index_factory}) with dimension {dimension}...")
     
-    # Create a flat index - simple but effective for smaller datasets
-    index = faiss.IndexFlatL2(dimension)
+    index = faiss.index_factory(dimension, index_factory, faiss.METRIC_L2)
+    
+    # Train and add on the GPU when possible; the saved index is always a CPU copy
+    gpu_index = to_gpu(index)
+    build_index = gpu_index if gpu_index is not None else index
+    
+    # IVF/PQ indexes need a training pass over the data before vectors can be added
+    if not build_index.is_trained:
+        print(f"Training index on {len(embeddings)} vectors...")
+        build_index.train(embeddings)
     
     # Add vectors to the index
-    index.add(embeddings)
+    build_index.add(embeddings)
+    if gpu_index is not None:
+        index = faiss.index_gpu_to_cpu(gpu_index)
     print(f" Added {index.ntotal} vectors to the index")
     
     # Save the index
@@ -126,22 +344,57 @@ def create_faiss_index(embeddings, metadatas, texts):
     
     # Save the metadata mapping (needed for retrieval)
     metadata_path = os.path.join(VECTOR_OUTPUT_DIR, "transcript_metadata.pkl")
+    # Highest protocol: protocol 5 pickles faster and loads faster than the default 4
     with open(metadata_path, 'wb') as f:
-        pickle.dump(metadatas, f)
+        pickle.dump(metadatas, f, protocol=pickle.HIGHEST_PROTOCOL)
     print(f" Saved metadata mapping to {metadata_path}")
     
     # Save raw texts for retrieval
     texts_path = os.path.join(VECTOR_OUTPUT_DIR, "transcript_texts.pkl")
     with open(texts_path, 'wb') as f:
-        pickle.dump(texts, f)
+        pickle.dump(texts, f, protocol=pickle.HIGHEST_PROTOCOL)
     print(f" Saved raw texts to {texts_path}")
     
     return index
 
-def test_search(index, embeddings, metadatas, model_name=MODEL_NAME, top_k=5):
-    """Test the search functionality with a sample query"""
+def binarize(embeddings):
+    """Pack the sign of each dimension into one bit (sentence-transformers' "ubinary")"""
+    return np.packbits(embeddings > 0, axis=-1)
+
+def create_binary_index(embeddings):
+    """Create and save a 1-bit-per-dimension Hamming index alongside the float index
+    
+    Vectors shrink 32x (384-d: 1536 bytes -> 48 bytes) and distances become popcounts.
+    Read it back with faiss.read_index_binary.
+    """
+    dimension = embeddings.shape[1]
+    index = faiss.IndexBinaryFlat(dimension)
+    index.add(binarize(embeddings))
+    
+    index_path = os.path.join(VECTOR_OUTPUT_DIR, "transcript_index_binary.faiss")
+    faiss.write_index_binary(index, index_path)
+    print(f" Saved binary index ({index.ntotal} vectors, {dimension // 8} bytes each) to {index_path}")
+    return index
+
+def search_binary(binary_index, embeddings, query_embedding, top_k):
+    """Hamming search over-fetching candidates, then rescore them by float L2 distance"""
+    _, candidates = binary_index.search(binarize(query_embedding), top_k * BINARY_RESCORE_FACTOR)
+    candidates = candidates[0][candidates[0] >= 0]
+    distances = ((embeddings[candidates] - query_embedding[0]) ** 2).sum(axis=1)
+    order = np.argsort(distances)[:top_k]
+    return distances[order][None, :], candidates[order][None, :]
+
+def test_search(index, embeddings, metadatas, model, top_k=5, binary_index=None):
+    """Test the search functionality with a sample query, reusing the indexing model"""
     print("\n=== Testing Search Functionality ===")
-    model = SentenceTransformer(model_name)
+    
+    try:
+        faiss.extract_index_ivf(index).nprobe = IVF_NPROBE
+    except RuntimeError:
+        pass  # Not an IVF index
+    gpu_index = to_gpu(index)
+    if gpu_index is not None:
+        index = gpu_index
     
     test_queries = [
         "options trading strategies for beginners",
@@ -150,14 +403,19 @@ def test_search(index, embeddings, metadatas, model_name=MODEL_NAME, top_k=5):
         "best technical indicators for trading"
     ]
     
-    for query in test_queries:
+    # Encode every query in one batch and search them in one call;
+    # FAISS parallelizes a multi-query search across queries
+    query_embeddings = model.encode(test_queries, convert_to_numpy=True).astype(np.float32, copy=False)
+    if binary_index is None:
+        all_distances, all_indices = index.search(query_embeddings, top_k)
+    
+    for qi, query in enumerate(test_queries):
         print(f"\nTest Query: '{query}'")
         
-        # Create embedding for query
-        query_embedding = model.encode([query])[0].reshape(1, -1).astype('float32')
-        
-        # Search the index
-        distances, indices = index.search(query_embedding, top_k)
+        if binary_index is not None:
+            distances, indices = search_binary(binary_index, embeddings, query_embeddings[qi:qi + 1], top_k)
+        else:
+            distances, indices = all_distances[qi:qi + 1], all_indices[qi:qi + 1]
         
         print(f"Top {top_k} results:")
         for i, (idx, distance) in enumerate(zip(indices[0], distances[0])):
@@ -196,19 +454,44 @@ def main(args):
     # Load processed transcript chunks
     texts, metadatas = load_processed_transcripts()
     
+    # Load the encoder once; test_search reuses it for the queries
+    backend = getattr(args, 'backend', None) or 'torch'
+    print(f"\nLoading embedding model: {args.model} ({backend})")
+    model = load_model(args.model, backend)
+    workers = getattr(args, 'workers', None) or 1
+    if getattr(args, 'compile', False):
+        # Compiled modules are per-process: only useful for in-process PyTorch encoding
+        if backend == 'torch' and workers == 1:
+            compile_model(model)
+        else:
+            print("ℹ️  --compile applies to --backend torch with a single worker; ignoring")
+    
     # Create embeddings
-    embeddings = create_embeddings(texts, model_name=args.model, batch_size=args.batch_size)
+    if getattr(args, 'no_embedding_cache', False):
+        embeddings = create_embeddings(texts, model, batch_size=args.batch_size, workers=workers)
+    else:
+        embeddings = create_embeddings_cached(texts, model, embedding_cache_key(args.model, backend, model),
+                                              batch_size=args.batch_size, workers=workers)
     
     # Create and save FAISS index
-    index = create_faiss_index(embeddings, metadatas, texts)
+    index_type = getattr(args, 'index_type', None)
+    if index_type:
+        index_factory = index_factory_for(index_type, len(texts))
+    else:
+        index_factory = getattr(args, 'index_factory', None) or FAISS_INDEX_FACTORY
+    precision = getattr(args, 'precision', None) or 'fp32'
+    index_factory = apply_precision(index_factory, precision)
+    index = create_faiss_index(embeddings, metadatas, texts, index_factory=index_factory)
+    binary_index = create_binary_index(embeddings) if precision == 'binary' else None
     
     # Test search if requested
     if args.test_search:
-        test_search(index, embeddings, metadatas, model_name=args.model)
+        test_search(index, embeddings, metadatas, model, binary_index=binary_index)
     
     print("\n"+"="*80)
     print(" Vector store creation complete!")
     print(f" Model used: {args.model}")
+    print(f" Index type: {index_factory}")
     print(f" Total chunks indexed: {len(texts)}")
     print(f"📁 Vector store saved to {VECTOR_OUTPUT_DIR}/")
     print("="*80)
@@ -220,8 +503,24 @@ if __name__ == "__main__":
                         help=f'Sentence transformer model to use (default: {MODEL_NAME})')
     parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
                         help=f'Batch size for embedding creation (default: {BATCH_SIZE})')
+    parser.add_argument('--backend', choices=BACKENDS, default='torch',
+                        help='Encoder runtime; onnx uses the int8-quantized ONNX export on CPU (default: torch)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Processes to encode with, one per GPU when CUDA is available (default: 1, in-process)')
+    parser.add_argument('--no-embedding-cache', action='store_true',
+                        help='Re-encode every chunk instead of reusing vectors from the previous build '
+                             f'(cached in {EMBEDDING_CACHE_DIR}, set OPTEEE_EMBEDDING_CACHE_DIR to move it)')
+    parser.add_argument('--compile', action='store_true',
+                        help='torch.compile the encoder before embedding (PyTorch backend, single worker)')
     parser.add_argument('--output-dir', type=str, default=None,
                         help='Output directory for vector store (default: use config)')
+    parser.add_argument('--index-factory', type=str, default=FAISS_INDEX_FACTORY,
+                        help=f'FAISS index_factory spec, e.g. HNSW32, "IVF4096,PQ64", Flat (default: {FAISS_INDEX_FACTORY})')
+    parser.add_argument('--index-type', choices=INDEX_TYPES, default=None,
+                        help='Index preset; overrides --index-factory (ivfpq sizes nlist to the corpus)')
+    parser.add_argument('--precision', choices=PRECISIONS, default='fp32',
+                        help='Stored vector precision; fp16/int8 store vectors at 1/2 / 1/4 the size, binary also writes '
+                             'a 1-bit Hamming index that --test-search queries with float rescoring (default: fp32)')
     parser.add_argument('--test-search', action='store_true',
                         help='Run test queries after creating the index')
     
@@ -10,6 +10,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 import os
+import asyncio
 import uvicorn
 from datetime import datetime
 from sqlalchemy.orm import Session
@@ -90,8 +91,6 @@ async def chat(request: ChatRequest, db: Session = Depends(get_db)):
         else:
             conversation = ConversationService.create_conversation(db)
 
-        ConversationService.add_message(db, conversation, "user", request.query)
-
         conversation_summary = ""
         if request.conversation_history:
             conversation_summary = f"\n\n[Test Mode] I can see our conversation history with {len(request.conversation_history)} previous messages. "
@@ -111,7 +110,9 @@ Format: {request.format}{conversation_summary}
 
 This is a test response to validate the conversation history functionality. In production, this would be answered using the RAG system with options trading knowledge."""
 
-        ConversationService.add_message(db, conversation, "assistant", test_answer)
+        ConversationService.add_messages(
+            db, conversation, [("user", request.query), ("assistant", test_answer)]
+        )
 
         return ChatResponse(
             answer=test_answer,
@@ -143,24 +144,24 @@ This is a test response to validate the conversation history functionality. In p
         else:
             conversation = ConversationService.create_conversation(db)
 
-        # Persist user message first.
-        ConversationService.add_message(db, conversation, "user", request.query)
-
-        # Prefer server-side history when conversation_id is present.
+        # Prefer server-side history when conversation_id is present. It is read
+        # before the current turn is persisted, so the loaded messages are exactly
+        # the history and no re-query is needed.
         if request.conversation_id:
-            refreshed = ConversationService.get_conversation(db, conversation.id)
-            history_messages = refreshed.messages if refreshed else []
             conversation_history = [
                 ConversationMessage(
                     role=m.role,
                     content=sanitize_history_content(m.role, m.content),
                     timestamp=m.created_at.isoformat(),
                 )
-                for m in history_messages[:-1]  # exclude current user message
+                for m in conversation.messages
             ]
         else:
             conversation_history = request.conversation_history or []
 
+        # Persist user message first, so the question survives a failed RAG call.
+        ConversationService.add_message(db, conversation, "user", request.query)
+
         result = await rag_service.process_query(
             query=request.query,
             provider=request.provider,
@@ -179,7 +180,7 @@ This is a test response to validate the conversation history functionality. In p
         
         return ChatResponse(
             answer=result["answer"],
-            sources=result["sources"],
+            sources=result["sources"] if request.include_sources else "",
             raw_sources=result["raw_sources"],
             wiki_references=result.get("wiki_references", []),
             timestamp=datetime.now().isoformat(),
@@ -278,7 +279,7 @@ async def wiki_index():
 @app.get("/api/wiki/index/document")
 async def wiki_index_document(include_html: bool = False):
     """Generated wiki/index.md as structured JSON for agent analysis."""
-    document = wiki_service.get_index_document(include_html=include_html)
+    document = await asyncio.to_thread(wiki_service.get_index_document, include_html=include_html)
     if document is None:
         raise HTTPException(status_code=404, detail="Wiki index document not found")
     return document
@@ -294,7 +295,9 @@ async def wiki_page(rel_path: str, output_format: str = Query("html", alias="for
     """
     if output_format not in {"html", "markdown", "json"}:
         raise HTTPException(status_code=400, detail="format must be html, markdown, or json")
-    page = wiki_service.get_page(
+    # Markdown rendering runs off the event loop so large pages don't stall other requests
+    page = await asyncio.to_thread(
+        wiki_service.get_page,
         rel_path,
         include_markdown=output_format in {"markdown", "json"},
         include_html=output_format in {"html", "json"},
@@ -307,7 +310,7 @@ async def wiki_page(rel_path: str, output_format: str = Query("html", alias="for
 @app.get("/wiki/page/{rel_path:path}", response_class=HTMLResponse)
 async def wiki_page_view(rel_path: str):
     """Standalone rendered wiki page — the target of chat 'Wiki References' links."""
-    html_doc = wiki_service.render_page_html(rel_path)
+    html_doc = await asyncio.to_thread(wiki_service.render_page_html, rel_path)
     if html_doc is None:
         raise HTTPException(status_code=404, detail="Wiki page not found")
     return HTMLResponse(content=html_doc)
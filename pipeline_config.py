@@ -60,6 +60,9 @@ WHISPER_MODEL_PARALLEL = "base"  # For parallel processing (better CPU utilizati
 PARALLEL_WORKERS = 8  # Number of parallel workers (adjust based on your CPU cores)
 PARALLEL_ENABLE = True  # Enable parallel processing by default
 BATCH_SIZE = 64  # Batch size for embedding generation (optimized from 32)
+# FAISS index type (faiss.index_factory spec). HNSW32 suits corpora under ~1M chunks;
+# use e.g. "IVF4096,PQ64" for much larger corpora, or "Flat" for exact brute-force search.
+FAISS_INDEX_FACTORY = os.getenv('OPTEEE_FAISS_INDEX_FACTORY', 'HNSW32').strip()
 MAX_RETRIES = 3  # Maximum retries for failed operations
 
 # File Validation
@@ -5,7 +5,6 @@ import pickle
 import argparse
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from typing import List, Dict, Any, Tuple, Optional
-import numpy as np
 import faiss
 from dotenv import load_dotenv
 
@@ -41,6 +40,9 @@ METADATA_PATH = os.path.join(VECTOR_STORE_DIR, "transcript_metadata.pkl")
 INDEX_PATH = os.path.join(VECTOR_STORE_DIR, "transcript_index.faiss")
 
 DEFAULT_TOP_K = 5
+# Search-time knobs for approximate indexes (see FAISS_INDEX_FACTORY in pipeline_config.py)
+DEFAULT_HNSW_EF_SEARCH = 64
+DEFAULT_IVF_NPROBE = 16
 DEFAULT_LLM_MODEL = "gpt-4.1-mini"  # Current OpenAI model that supports temperature
 DEFAULT_CLAUDE_MODEL = "claude-haiku-4-5"  # Default Claude model fallback
 DEFAULT_OLLAMA_MODEL = "gemma4:e4b"  # Ollama model (e.g. gemma4:e4b, gemma3:270m)
@@ -394,12 +396,19 @@ def get_vector_store_path(filename):
 class CustomFAISSRetriever:
     """Custom retriever using FAISS index"""
     
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2", top_k: int = DEFAULT_TOP_K, sort_by: str = "relevance"):
-        """Initialize the retriever"""
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", top_k: int = DEFAULT_TOP_K, sort_by: str = "relevance",
+                 ef_search: int = DEFAULT_HNSW_EF_SEARCH, nprobe: int = DEFAULT_IVF_NPROBE):
+        """Initialize the retriever
+
+        ef_search and nprobe tune HNSW and IVF indexes respectively; they are
+        ignored for flat indexes.
+        """
         self.model_name = model_name
         self.top_k = top_k
         self.sort_by = sort_by  # Can be 'relevance', 'date', or 'combined'
         self.fetch_multiplier = 2
+        self.ef_search = ef_search
+        self.nprobe = nprobe
         self.model = None
         self.index = None
         self.texts = []
@@ -484,6 +493,7 @@ class CustomFAISSRetriever:
         try:
             print("Loading vector store files...")
             self.index = faiss.read_index(get_vector_store_path("transcript_index.faiss"))
+            self._configure_index_search()
             
             with open(get_vector_store_path("transcript_texts.pkl"), 'rb') as f:
                 self.texts = pickle.load(f)
@@ -497,6 +507,20 @@ class CustomFAISSRetriever:
             print(f"❌ Error loading vector store: {str(e)}")
             sys.exit(1)
     
+    def _configure_index_search(self):
+        """Apply HNSW/IVF search-time parameters to the loaded index"""
+        index = faiss.downcast_index(self.index)
+        if hasattr(index, 'hnsw'):
+            # efSearch must be at least the number of results requested
+            index.hnsw.efSearch = max(self.ef_search, self.top_k * self.fetch_multiplier)
+            print(f" HNSW index: efSearch={index.hnsw.efSearch}")
+            return
+        try:
+            faiss.extract_index_ivf(self.index).nprobe = self.nprobe
+            print(f" IVF index: nprobe={self.nprobe}")
+        except RuntimeError:
+            pass  # Flat index - exact search, nothing to tune
+    
     def expand_query(self, query: str) -> str:
         """
         Expand query with common trading acronyms and related terms.
@@ -554,9 +578,8 @@ class CustomFAISSRetriever:
         # Fetch 2x the requested number of results
         fetch_k = self.top_k * self.fetch_multiplier
         
-        # Encode the expanded query
-        query_embedding = self.model.encode([expanded_query])[0]
-        query_embedding = np.array([query_embedding]).astype('float32')
+        # Encode the expanded query; encode() already returns a (1, dim) float32 array
+        query_embedding = self.model.encode([expanded_query], convert_to_numpy=True)
         
         # Search the index for more results than needed
         distances, indices = self.index.search(query_embedding, fetch_k)
@@ -2,12 +2,13 @@ import importlib
 import json
 import os
 import unittest
+from unittest.mock import patch
 
 from pydantic import ValidationError
 from fastapi.testclient import TestClient
 
 from app.models.chat_models import ChatRequest
-from app.services.formatters import ResponseFormatter
+from app.services.formatters import BotFormatter, ResponseFormatter
 
 
 class BotApiContractTests(unittest.TestCase):
@@ -62,6 +63,18 @@ class BotApiContractTests(unittest.TestCase):
         self.assertIsInstance(sources_json, list)
         self.assertEqual(sources_json[0]["title"], "Sample Video")
 
+    def test_bot_formatter_replaces_video_id_titles_with_filename(self):
+        answer = BotFormatter()._improve_document_references(
+            "See [Document 1] and [Document 2].",
+            [
+                {"title": "a-B_c1234Xy", "filename": "Gamma Basics.mp3", "url": "https://example.com/1"},
+                {"title": "Theta Decay", "url": "https://example.com/2"},
+            ],
+        )
+
+        self.assertIn("[Video 1: Gamma Basics](<https://example.com/1>)", answer)
+        self.assertIn("[Video 2: Theta Decay](<https://example.com/2>)", answer)
+
     def test_chat_endpoint_json_returns_token_usage(self):
         response = self.client.post(
             "/api/chat",
@@ -112,3 +125,20 @@ class BotApiContractTests(unittest.TestCase):
         self.assertIn("Effort: medium", body["answer"])
         self.assertIn("Model: claude-sonnet-4-5", body["answer"])
 
+    def test_chat_endpoint_keeps_user_message_when_rag_fails(self):
+        class FailingRagService:
+            async def process_query(self, **kwargs):
+                raise RuntimeError("provider timed out")
+
+        conversation_id = self.client.post("/api/conversations").json()["id"]
+        with patch.object(self.main_module, "TEST_MODE", False), \
+                patch.object(self.main_module, "rag_service", FailingRagService()):
+            response = self.client.post(
+                "/api/chat",
+                json={"query": "What is vega?", "conversation_id": conversation_id, "format": "json"},
+            )
+        self.assertEqual(response.status_code, 500)
+
+        detail = self.client.get(f"/api/conversations/{conversation_id}").json()
+        self.assertEqual([(m["role"], m["content"]) for m in detail["messages"]], [("user", "What is vega?")])
+        self.assertEqual(detail["title"], "What is vega?")
@@ -33,3 +33,16 @@ class ConversationServiceTests(unittest.TestCase):
 
         self.assertEqual(reloaded.title, "What is an iron condor?")
 
+
+    def test_add_messages_persists_turn_in_order(self):
+        conversation = ConversationService.create_conversation(self.db)
+
+        ConversationService.add_messages(
+            self.db,
+            conversation,
+            [("user", "What is theta?"), ("assistant", "Time decay.")],
+        )
+        reloaded = ConversationService.get_conversation(self.db, conversation.id)
+
+        self.assertEqual([m.role for m in reloaded.messages], ["user", "assistant"])
+        self.assertEqual(reloaded.title, "What is theta?")
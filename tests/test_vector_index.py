@@ -0,0 +1,169 @@
+import argparse
+import json
+import os
+import pickle
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import faiss
+import numpy as np
+import torch
+
+import create_vector_store
+
+
+def _sample_embeddings(count=200, dimension=16):
+    rng = np.random.default_rng(0)
+    return rng.standard_normal((count, dimension)).astype("float32")
+
+
+class _CountingModel:
+    """Stand-in encoder: embeds each text as [len(text), 1] and records what it encoded"""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, **kwargs):
+        self.encoded.extend(texts)
+        return np.array([[len(t), 1.0] for t in texts], dtype="float32")
+
+
+class VectorIndexTests(unittest.TestCase):
+    def test_create_faiss_index_uses_index_factory(self):
+        embeddings = _sample_embeddings()
+        texts = [f"chunk {i}" for i in range(len(embeddings))]
+        metadatas = [{"text": text} for text in texts]
+
+        with tempfile.TemporaryDirectory() as tmp_dir, patch.object(create_vector_store, "VECTOR_OUTPUT_DIR", tmp_dir):
+            index = create_vector_store.create_faiss_index(embeddings, metadatas, texts, index_factory="HNSW32")
+            self.assertTrue(os.path.exists(os.path.join(tmp_dir, "transcript_index.faiss")))
+
+        self.assertTrue(hasattr(faiss.downcast_index(index), "hnsw"))
+        self.assertEqual(index.ntotal, len(embeddings))
+        _, indices = index.search(embeddings[:3], 1)
+        self.assertEqual(indices[:, 0].tolist(), [0, 1, 2])
+
+    def test_index_type_presets_map_to_factory_specs(self):
+        self.assertEqual(create_vector_store.index_factory_for("flat", 10_000), "Flat")
+        self.assertEqual(create_vector_store.index_factory_for("hnsw", 10_000), "HNSW32")
+        self.assertEqual(create_vector_store.index_factory_for("ivfpq", 10_000), "IVF400,PQ16")
+
+    def test_int8_precision_uses_scalar_quantized_storage(self):
+        self.assertEqual(create_vector_store.apply_precision("Flat", "int8"), "SQ8")
+        self.assertEqual(create_vector_store.apply_precision("HNSW32", "int8"), "HNSW32_SQ8")
+        self.assertEqual(create_vector_store.apply_precision("IVF64,Flat", "int8"), "IVF64,SQ8")
+        self.assertEqual(create_vector_store.apply_precision("HNSW32", "fp32"), "HNSW32")
+        self.assertEqual(create_vector_store.apply_precision("HNSW32", "fp16"), "HNSW32_SQfp16")
+        with self.assertRaises(ValueError):
+            create_vector_store.apply_precision("IVF64,PQ16", "int8")
+
+        embeddings = _sample_embeddings()
+        texts = [f"chunk {i}" for i in range(len(embeddings))]
+        metadatas = [{"text": text} for text in texts]
+        with tempfile.TemporaryDirectory() as tmp_dir, patch.object(create_vector_store, "VECTOR_OUTPUT_DIR", tmp_dir):
+            index = create_vector_store.create_faiss_index(embeddings, metadatas, texts, index_factory="SQ8")
+
+        self.assertIsInstance(faiss.downcast_index(index), faiss.IndexScalarQuantizer)
+        _, indices = index.search(embeddings[:3], 1)
+        self.assertEqual(indices[:, 0].tolist(), [0, 1, 2])
+
+    def test_binary_index_search_rescores_with_float_distances(self):
+        embeddings = _sample_embeddings()
+
+        with tempfile.TemporaryDirectory() as tmp_dir, patch.object(create_vector_store, "VECTOR_OUTPUT_DIR", tmp_dir):
+            binary_index = create_vector_store.create_binary_index(embeddings)
+            reloaded = faiss.read_index_binary(os.path.join(tmp_dir, "transcript_index_binary.faiss"))
+
+        self.assertEqual(reloaded.ntotal, len(embeddings))
+        self.assertEqual(binary_index.code_size, embeddings.shape[1] // 8)
+        distances, indices = create_vector_store.search_binary(binary_index, embeddings, embeddings[5:6], 3)
+        self.assertEqual(indices.shape, (1, 3))
+        self.assertEqual(indices[0, 0], 5)
+        self.assertAlmostEqual(float(distances[0, 0]), 0.0, places=5)
+
+    def test_create_embeddings_restores_input_order(self):
+        class LengthModel:
+            def __init__(self):
+                self.batches = []
+
+            def encode(self, texts, **kwargs):
+                self.batches.append(list(texts))
+                return np.array([[len(t), 0.0] for t in texts], dtype="float32")
+
+        model = LengthModel()
+        texts = ["x" * n for n in (5, 1, 4, 2, 3)]
+        embeddings = create_vector_store.create_embeddings(texts, model, batch_size=2)
+
+        self.assertEqual(embeddings[:, 0].tolist(), [5, 1, 4, 2, 3])
+        self.assertEqual(model.batches[0], ["x", "xx"])
+
+    def test_create_embeddings_encodes_duplicate_texts_once(self):
+        model = _CountingModel()
+        embeddings = create_vector_store.create_embeddings(["intro", "abc", "intro", "de"], model)
+
+        self.assertEqual(sorted(model.encoded), ["abc", "de", "intro"])
+        self.assertEqual(embeddings[:, 0].tolist(), [5, 3, 5, 2])
+
+    def test_cached_embeddings_only_encode_new_texts(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, patch.object(create_vector_store, "EMBEDDING_CACHE_DIR", tmp_dir):
+            first = _CountingModel()
+            create_vector_store.create_embeddings_cached(["aa", "bbb"], first, "m")
+            second = _CountingModel()
+            embeddings = create_vector_store.create_embeddings_cached(["bbb", "c", "aa"], second, "m")
+            other_model = _CountingModel()
+            create_vector_store.create_embeddings_cached(["aa"], other_model, "other")
+
+        self.assertEqual(first.encoded, ["aa", "bbb"])
+        self.assertEqual(second.encoded, ["c"])
+        self.assertEqual(embeddings[:, 0].tolist(), [3, 1, 2])
+        self.assertEqual(other_model.encoded, ["aa"])
+
+    def test_embedding_cache_key_separates_dtypes(self):
+        fp32_key = create_vector_store.embedding_cache_key("m", "torch", torch.nn.Linear(2, 2))
+        fp16_key = create_vector_store.embedding_cache_key("m", "torch", torch.nn.Linear(2, 2).half())
+
+        self.assertEqual(fp32_key, "m|torch|cpu|float32")
+        self.assertEqual(fp16_key, "m|torch|cpu|float16")
+        self.assertEqual(create_vector_store.embedding_cache_key("m", "onnx", _CountingModel()), "m|onnx|cpu|none")
+
+    def test_main_builds_index_from_processed_chunks(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            processed_dir = os.path.join(tmp_dir, "processed_transcripts")
+            pdf_dir = os.path.join(tmp_dir, "processed_pdfs")
+            output_dir = os.path.join(tmp_dir, "vector_store")
+            cache_dir = os.path.join(tmp_dir, "embedding_cache")
+            os.makedirs(processed_dir)
+            os.makedirs(pdf_dir)
+            with open(os.path.join(processed_dir, "vid.json"), "w") as f:
+                json.dump([{"text": "gamma basics", "title": "Video"}, {"text": "  ", "title": "Video"}], f)
+            with open(os.path.join(pdf_dir, "paper.json"), "w") as f:
+                json.dump([{"text": "a paper chunk", "source_type": "pdf"}], f)
+
+            # Same fields rebuild_vector_store.py and run_pipeline.py set
+            args = argparse.Namespace(model="stub", batch_size=32, output_dir=output_dir, test_search=False)
+            cwd = os.getcwd()
+            os.chdir(tmp_dir)  # processed_pdfs/ is read relative to the working directory
+            try:
+                with patch.object(create_vector_store, "PROCESSED_DIR", processed_dir), \
+                        patch.object(create_vector_store, "VECTOR_OUTPUT_DIR", create_vector_store.VECTOR_OUTPUT_DIR), \
+                        patch.object(create_vector_store, "EMBEDDING_CACHE_DIR", cache_dir), \
+                        patch.object(create_vector_store, "load_model", lambda *a: _CountingModel()):
+                    create_vector_store.main(args)
+            finally:
+                os.chdir(cwd)
+
+            index = faiss.read_index(os.path.join(output_dir, "transcript_index.faiss"))
+            with open(os.path.join(output_dir, "transcript_texts.pkl"), "rb") as f:
+                texts = pickle.load(f)
+            written = sorted(os.listdir(output_dir)), sorted(os.listdir(cache_dir))
+
+        self.assertEqual(texts, ["gamma basics", "a paper chunk"])
+        self.assertEqual(index.ntotal, 2)
+        # The embedding cache stays out of the committed vector_store/ directory
+        self.assertFalse([name for name in written[0] if name.startswith("embedding_cache")])
+        self.assertEqual(written[1], ["embedding_cache.npy", "embedding_cache_keys.npy"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -100,10 +100,10 @@ def search_vector_store(query, top_k=TOP_K):
     
     # Encode query
     model = get_model()
-    query_embedding = model.encode([query])
+    query_embedding = model.encode([query], convert_to_numpy=True)
     
     # Search
-    distances, indices = index.search(np.array(query_embedding).astype('float32'), top_k)
+    distances, indices = index.search(query_embedding, top_k)
     
     # Format results
     results = []